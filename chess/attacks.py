@@ -0,0 +1,57 @@
+# Per-square lookup tables for working backwards from a target square to its attackers.
+# Every table is indexed [row][col] and holds (row, col) tuples, like Board.grid.
+
+KNIGHT_OFFSETS = [(2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1), (-1, -2), (1, -2), (2, -1)]
+KING_OFFSETS = [(0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)]
+ROOK_DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+BISHOP_DIRECTIONS = [(1, 1), (1, -1), (-1, -1), (-1, 1)]
+
+
+def _in_bounds(r, c):
+    return 0 <= r < 8 and 0 <= c < 8
+
+
+def _offset_table(offsets):
+    return [[tuple((r + dr, c + dc) for dr, dc in offsets if _in_bounds(r + dr, c + dc))
+             for c in range(8)] for r in range(8)]
+
+
+def _ray_table(directions):
+    table = []
+    for r in range(8):
+        row = []
+        for c in range(8):
+            rays = []
+            for dr, dc in directions:
+                ray = []
+                rr, cc = r + dr, c + dc
+                while _in_bounds(rr, cc):
+                    ray.append((rr, cc))
+                    rr, cc = rr + dr, cc + dc
+                if ray:
+                    rays.append(tuple(ray))
+            row.append(tuple(rays))
+        table.append(row)
+    return table
+
+
+KNIGHT_SQUARES = _offset_table(KNIGHT_OFFSETS)
+KING_SQUARES = _offset_table(KING_OFFSETS)
+
+# PAWN_ATTACKER_SQUARES[color][row][col]: where a pawn of `color` must stand to attack (row, col).
+# White pawns move up the board (towards row 0), so they attack from the row below.
+PAWN_ATTACKER_SQUARES = {
+    'white': _offset_table([(1, -1), (1, 1)]),
+    'black': _offset_table([(-1, -1), (-1, 1)]),
+}
+
+# Rays fan out from each square, nearest square first, so the first piece met is the only
+# candidate attacker along that line
+ROOK_RAYS = _ray_table(ROOK_DIRECTIONS)
+BISHOP_RAYS = _ray_table(BISHOP_DIRECTIONS)
+
+# PAWN_ATTACK_SQUARES[color][row][col]: the squares a pawn of `color` on (row, col) attacks
+PAWN_ATTACK_SQUARES = {
+    'white': _offset_table([(-1, -1), (-1, 1)]),
+    'black': _offset_table([(1, -1), (1, 1)]),
+}
@@ -0,0 +1,184 @@
+"""Search benchmarks on a fixed set of positions.
+
+Run with: python -m chess.benchmark [depth] [--workers N]
+      or: python -m chess.benchmark [depth] --suite depth|time [--move-time S] [--json FILE]
+
+The depth and time suites record nodes, nodes per second, time to each
+depth, transposition table hit rate, cutoff rates and the chosen move for
+every position as JSON, so runs from different commits can be diffed.
+"""
+import argparse
+import json
+import sys
+import time
+from chess.game import Game
+from chess.chess_ai import ChessAI
+from chess.perft import PERFT_POSITIONS, move_to_uci
+
+BENCHMARK_POSITIONS = {
+    'start': PERFT_POSITIONS['start'][0],
+    'open game': 'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3',
+    'italian': 'r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4',
+    'sicilian': 'rnbqkbnr/pp2pppp/3p4/8/3NP3/8/PPP2PPP/RNBQKB1R b KQkq - 0 4',
+    'queens gambit': 'rnbqkb1r/ppp2ppp/4pn2/3p4/2PP4/2N5/PP2PPPP/R1BQKBNR w KQkq - 2 4',
+    'kiwipete': PERFT_POSITIONS['kiwipete'][0],
+    'middlegame': PERFT_POSITIONS['middlegame'][0],
+    'endgame': PERFT_POSITIONS['endgame'][0],
+}
+
+# Iterative deepening limit for the fixed-time suite; the clock stops it first
+TIME_SUITE_DEPTH = 20
+
+
+def benchmark_position(name):
+    """Set up one of the benchmark positions."""
+    game = Game(ai_opponent=False, ai_autoplay=False)
+    game.load_fen(BENCHMARK_POSITIONS[name])
+    return game
+
+
+def search_record(game, depth, move_time=0, workers=1, **ai_options):
+    """Search one position and return what the benchmark suites record about it."""
+    ai = ChessAI(game.turn, depth, **ai_options)
+    ai.verbose = False
+    ai.workers = workers
+    # Iteration d searches exactly d plies, so the depths recorded are the depths searched
+    ai.adaptive_depth = False
+    depth_times = {}
+
+    def record_depth(info):
+        if info['completed']:
+            depth_times[info['depth']] = round(info['time'], 4)
+
+    ai.progress_callback = record_depth
+    start = time.time()
+    try:
+        move = ai.choose_move(game, move_time=move_time)
+    finally:
+        ai.close()
+    seconds = time.time() - start
+    stats = ai.stats()
+    search = stats['search']
+    cutoffs = search['beta_cutoffs']
+    return {
+        'move': move_to_uci(move) if move else None,
+        'score': ai.previous_eval,
+        'nodes': ai.nodes_evaluated,
+        'seconds': round(seconds, 4),
+        'nps': round(ai.nodes_evaluated / max(seconds, 1e-9)),
+        'depth_reached': max(depth_times, default=0),
+        'time_to_depth': depth_times,
+        'tt_hit_rate': round(stats['transposition_table']['hit_rate'], 4),
+        'cutoff_rate': round(cutoffs / max(ai.nodes_evaluated, 1), 4),
+        'first_move_cutoff_rate': round(search['first_move_cutoffs'] / cutoffs, 4) if cutoffs else None,
+        'search': search,
+    }
+
+
+def run_search(game, depth, workers=1, **ai_options):
+    """Search one position to a fixed depth; returns (move, nodes, seconds)."""
+    record = search_record(game, depth, workers=workers, **ai_options)
+    return record['move'], record['nodes'], record['seconds']
+
+
+def run_suite(depth=None, move_time=None, workers=1, **ai_options):
+    """Search every benchmark position to a fixed depth, or for a fixed time per move.
+
+    Returns the settings and a record per position (see search_record) as a
+    dict ready for json.dump.
+    """
+    search_depth = depth if move_time is None else TIME_SUITE_DEPTH
+    results = {
+        'suite': 'time' if move_time is not None else 'depth',
+        'depth': search_depth,
+        'move_time': move_time,
+        'workers': workers,
+        'options': ai_options,
+        'positions': {},
+    }
+    for name in BENCHMARK_POSITIONS:
+        game = benchmark_position(name)
+        results['positions'][name] = search_record(game, search_depth, move_time or 0, workers, **ai_options)
+    records = results['positions'].values()
+    nodes = sum(record['nodes'] for record in records)
+    seconds = sum(record['seconds'] for record in records)
+    results['total'] = {'nodes': nodes, 'seconds': round(seconds, 4), 'nps': round(nodes / max(seconds, 1e-9))}
+    return results
+
+
+def compare_search_modes(depth=3, modes=('minimax', 'pvs')):
+    """Search every benchmark position with each mode and print nodes and time."""
+    totals = {mode: [0, 0.0] for mode in modes}
+    print(f"{'position':<16}" + "".join(f"{mode + ' nodes':>16}{mode + ' s':>12}" for mode in modes))
+    for name in BENCHMARK_POSITIONS:
+        game = benchmark_position(name)
+        row = f"{name:<16}"
+        for mode in modes:
+            move, nodes, seconds = run_search(game, depth, search_mode=mode)
+            totals[mode][0] += nodes
+            totals[mode][1] += seconds
+            row += f"{nodes:>16}{seconds:>12.2f}"
+        print(row)
+    print(f"{'total':<16}" + "".join(f"{totals[mode][0]:>16}{totals[mode][1]:>12.2f}" for mode in modes))
+    return totals
+
+
+def speedup_curve(depth=4, max_workers=4, search_mode='pvs'):
+    """Search every benchmark position with 1..max_workers processes and print the speedup.
+
+    Each worker count gets one ChessAI per side to move, whose pool is
+    started and warmed up before any search is timed, so the times are
+    search time rather than process start-up.
+    """
+    baseline = None
+    print(f"{'workers':>8}{'nodes':>12}{'seconds':>10}{'speedup':>10}")
+    for workers in range(1, max_workers + 1):
+        nodes = 0
+        seconds = 0.0
+        ais = {}
+        try:
+            for name in BENCHMARK_POSITIONS:
+                game = benchmark_position(name)
+                ai = ais.get(game.turn)
+                if ai is None:
+                    ai = ais[game.turn] = ChessAI(game.turn, depth, search_mode=search_mode)
+                    ai.verbose = False
+                    ai.workers = workers
+                    ai.choose_move(game, depth=1)
+                start = time.time()
+                ai.choose_move(game, depth=depth)
+                seconds += time.time() - start
+                nodes += ai.nodes_evaluated
+        finally:
+            for ai in ais.values():
+                ai.close()
+        baseline = baseline or seconds
+        print(f"{workers:>8}{nodes:>12}{seconds:>10.2f}{baseline / seconds:>10.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Search benchmarks")
+    parser.add_argument('depth', nargs='?', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=0,
+                        help="print the speedup from 1 up to this many worker processes, "
+                             "or with --suite, search with this many")
+    parser.add_argument('--suite', choices=('depth', 'time'),
+                        help="run the fixed-depth or fixed-time suite and write JSON results")
+    parser.add_argument('--move-time', type=float, default=1.0,
+                        help="seconds per position for the time suite")
+    parser.add_argument('--search-mode', choices=('minimax', 'pvs'), default='pvs')
+    parser.add_argument('--json', default='-', help="file for the suite results (default: stdout)")
+    args = parser.parse_args()
+    if args.suite:
+        move_time = args.move_time if args.suite == 'time' else None
+        results = run_suite(args.depth, move_time, max(args.workers, 1), search_mode=args.search_mode)
+        if args.json == '-':
+            json.dump(results, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.json, 'w') as f:
+                json.dump(results, f, indent=2)
+    elif args.workers:
+        speedup_curve(args.depth, args.workers)
+    else:
+        compare_search_modes(args.depth)
@@ -0,0 +1,346 @@
+from chess.zobrist import (PIECE_KEYS, SIDE_KEY, CASTLING_KEYS, EN_PASSANT_KEYS,
+                           WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE)
+
+# Squares are numbered row * 8 + col, with row 0 being black's back rank, matching Board.grid
+WHITE, BLACK = 0, 1
+COLORS = ('white', 'black')
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+PIECE_NAMES = ('Pawn', 'Knight', 'Bishop', 'Rook', 'Queen', 'King')
+PROMOTIONS = (('Q', QUEEN), ('R', ROOK), ('B', BISHOP), ('N', KNIGHT))
+PROMOTION_TYPES = {'Q': QUEEN, 'R': ROOK, 'B': BISHOP, 'N': KNIGHT}
+
+# Directions as (row step, col step); index order is used by the ray tables below
+DIRECTIONS = [(-1, 0), (0, -1), (-1, -1), (-1, 1), (1, 0), (0, 1), (1, 1), (1, -1)]
+ROOK_DIRECTIONS = (0, 1, 4, 5)
+BISHOP_DIRECTIONS = (2, 3, 6, 7)
+# Directions 4-7 walk towards higher square numbers, so their first blocker is the lowest bit
+POSITIVE_DIRECTIONS = (False, False, False, False, True, True, True, True)
+
+
+def _square_mask(r, c):
+    return 1 << (r * 8 + c) if 0 <= r < 8 and 0 <= c < 8 else 0
+
+
+def _step_table(steps):
+    table = []
+    for sq in range(64):
+        r, c = divmod(sq, 8)
+        mask = 0
+        for dr, dc in steps:
+            mask |= _square_mask(r + dr, c + dc)
+        table.append(mask)
+    return table
+
+
+KNIGHT_ATTACKS = _step_table([(2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1), (-1, -2), (1, -2), (2, -1)])
+KING_ATTACKS = _step_table(DIRECTIONS)
+# PAWN_ATTACKS[color][sq]: squares attacked by a pawn of `color` standing on sq
+PAWN_ATTACKS = (_step_table([(-1, -1), (-1, 1)]), _step_table([(1, -1), (1, 1)]))
+
+
+def _ray_table():
+    rays = []
+    for dr, dc in DIRECTIONS:
+        table = []
+        for sq in range(64):
+            r, c = divmod(sq, 8)
+            mask = 0
+            r, c = r + dr, c + dc
+            while 0 <= r < 8 and 0 <= c < 8:
+                mask |= 1 << (r * 8 + c)
+                r, c = r + dr, c + dc
+            table.append(mask)
+        rays.append(table)
+    return rays
+
+
+RAYS = _ray_table()
+
+# Castling rights that survive a move touching each square
+CASTLING_MASK = [0xF] * 64
+CASTLING_MASK[60] &= ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASK[63] &= ~WHITE_KINGSIDE
+CASTLING_MASK[56] &= ~WHITE_QUEENSIDE
+CASTLING_MASK[4] &= ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASK[7] &= ~BLACK_KINGSIDE
+CASTLING_MASK[0] &= ~BLACK_QUEENSIDE
+
+# PIECE_SQUARE_KEYS[color * 6 + piece type][sq], shared with the Board's Zobrist keys
+PIECE_SQUARE_KEYS = [PIECE_KEYS[color][name] for color in COLORS for name in PIECE_NAMES]
+
+
+def slider_attacks(sq, occupied, directions):
+    """Squares attacked from sq along the given ray directions, stopping at blockers."""
+    attacks = 0
+    for d in directions:
+        ray = RAYS[d][sq]
+        blockers = ray & occupied
+        if blockers:
+            if POSITIVE_DIRECTIONS[d]:
+                first = (blockers & -blockers).bit_length() - 1
+            else:
+                first = blockers.bit_length() - 1
+            ray ^= RAYS[d][first]
+        attacks |= ray
+    return attacks
+
+
+def iter_bits(bb):
+    """Yield the square index of every set bit, lowest first."""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def to_square(pos):
+    return pos[0] * 8 + pos[1]
+
+
+def to_position(sq):
+    return divmod(sq, 8)
+
+
+class BitboardPosition:
+    """Bitboard-backed position: twelve piece bitboards plus per-color occupancy masks.
+
+    Moves are (from_sq, to_sq, promotion) tuples with promotion one of 'Q', 'R',
+    'B', 'N' or None, the same encoding ChessAI uses with (row, col) squares.
+    """
+    def __init__(self):
+        # pieces[color * 6 + piece type]
+        self.pieces = [0] * 12
+        self.occupancy = [0, 0]
+        self.side = WHITE
+        self.castling = 0
+        self.en_passant = None
+        self.key = 0
+        self._history = []
+
+    @classmethod
+    def from_board(cls, board):
+        """Build a bitboard position from a grid-based Board."""
+        position = cls()
+        for r in range(8):
+            for c in range(8):
+                piece = board.grid[r][c]
+                if piece:
+                    color = WHITE if piece.color == 'white' else BLACK
+                    index = color * 6 + PIECE_NAMES.index(piece.__class__.__name__)
+                    position.pieces[index] |= 1 << (r * 8 + c)
+        position.side = WHITE if board.side_to_move == 'white' else BLACK
+        position.castling = board.castling_rights()
+        if board.en_passant_target:
+            position.en_passant = to_square(board.en_passant_target)
+        position._update_occupancy()
+        position.key = position.compute_key()
+        return position
+
+    def _update_occupancy(self):
+        pieces = self.pieces
+        self.occupancy[WHITE] = pieces[0] | pieces[1] | pieces[2] | pieces[3] | pieces[4] | pieces[5]
+        self.occupancy[BLACK] = pieces[6] | pieces[7] | pieces[8] | pieces[9] | pieces[10] | pieces[11]
+
+    def compute_key(self):
+        """Zobrist key from scratch; equal to Board.zobrist_key for the same position."""
+        key = 0
+        for index in range(12):
+            for sq in iter_bits(self.pieces[index]):
+                key ^= PIECE_SQUARE_KEYS[index][sq]
+        if self.side == BLACK:
+            key ^= SIDE_KEY
+        key ^= CASTLING_KEYS[self.castling]
+        if self.en_passant is not None:
+            key ^= EN_PASSANT_KEYS[self.en_passant & 7]
+        return key
+
+    def piece_at(self, sq):
+        """Return (color, piece type) of the piece on sq, or None."""
+        bit = 1 << sq
+        if not (self.occupancy[WHITE] | self.occupancy[BLACK]) & bit:
+            return None
+        for index in range(12):
+            if self.pieces[index] & bit:
+                return divmod(index, 6)
+        return None
+
+    def king_square(self, color):
+        return self.pieces[color * 6 + KING].bit_length() - 1
+
+    def is_attacked(self, sq, by_color):
+        """Check if sq is attacked by any piece of by_color, working back from the square."""
+        pieces = self.pieces
+        base = by_color * 6
+        if PAWN_ATTACKS[by_color ^ 1][sq] & pieces[base + PAWN]:
+            return True
+        if KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT]:
+            return True
+        if KING_ATTACKS[sq] & pieces[base + KING]:
+            return True
+        occupied = self.occupancy[WHITE] | self.occupancy[BLACK]
+        queens = pieces[base + QUEEN]
+        if slider_attacks(sq, occupied, BISHOP_DIRECTIONS) & (pieces[base + BISHOP] | queens):
+            return True
+        if slider_attacks(sq, occupied, ROOK_DIRECTIONS) & (pieces[base + ROOK] | queens):
+            return True
+        return False
+
+    def in_check(self, color=None):
+        if color is None:
+            color = self.side
+        king = self.pieces[color * 6 + KING]
+        if not king:
+            return False
+        return self.is_attacked(king.bit_length() - 1, color ^ 1)
+
+    def make_move(self, move):
+        """Play a move in place; undo it with unmake_move."""
+        from_sq, to_sq, promotion = move
+        pieces = self.pieces
+        self._history.append((pieces[:], self.side, self.castling, self.en_passant, self.key))
+        us = self.side
+        them = us ^ 1
+        from_bit = 1 << from_sq
+        to_bit = 1 << to_sq
+        key = self.key
+
+        moving = None
+        for index in range(us * 6, us * 6 + 6):
+            if pieces[index] & from_bit:
+                moving = index
+                break
+        piece_type = moving - us * 6
+
+        # Remove whatever we capture, including a pawn taken en passant
+        if self.occupancy[them] & to_bit:
+            for index in range(them * 6, them * 6 + 6):
+                if pieces[index] & to_bit:
+                    pieces[index] ^= to_bit
+                    key ^= PIECE_SQUARE_KEYS[index][to_sq]
+                    break
+        elif piece_type == PAWN and to_sq == self.en_passant:
+            captured_sq = to_sq + 8 if us == WHITE else to_sq - 8
+            pieces[them * 6 + PAWN] ^= 1 << captured_sq
+            key ^= PIECE_SQUARE_KEYS[them * 6 + PAWN][captured_sq]
+
+        pieces[moving] ^= from_bit
+        key ^= PIECE_SQUARE_KEYS[moving][from_sq]
+        if piece_type == PAWN and to_sq // 8 == (0 if us == WHITE else 7):
+            # Board.move_piece promotes to a queen when no piece is given
+            landing = us * 6 + PROMOTION_TYPES.get(promotion, QUEEN)
+        else:
+            landing = moving
+        pieces[landing] |= to_bit
+        key ^= PIECE_SQUARE_KEYS[landing][to_sq]
+
+        if piece_type == KING and abs(to_sq - from_sq) == 2:
+            if to_sq > from_sq:
+                rook_from, rook_to = from_sq + 3, from_sq + 1
+            else:
+                rook_from, rook_to = from_sq - 4, from_sq - 1
+            rook = us * 6 + ROOK
+            pieces[rook] ^= (1 << rook_from) | (1 << rook_to)
+            key ^= PIECE_SQUARE_KEYS[rook][rook_from] ^ PIECE_SQUARE_KEYS[rook][rook_to]
+
+        if self.en_passant is not None:
+            key ^= EN_PASSANT_KEYS[self.en_passant & 7]
+        self.en_passant = None
+        if piece_type == PAWN and abs(to_sq - from_sq) == 16:
+            self.en_passant = (from_sq + to_sq) // 2
+            key ^= EN_PASSANT_KEYS[to_sq & 7]
+
+        castling = self.castling & CASTLING_MASK[from_sq] & CASTLING_MASK[to_sq]
+        key ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[castling] ^ SIDE_KEY
+        self.castling = castling
+        self.side = them
+        self.key = key
+        self._update_occupancy()
+
+    def unmake_move(self):
+        """Take back the last move played with make_move."""
+        pieces, self.side, self.castling, self.en_passant, self.key = self._history.pop()
+        self.pieces = pieces
+        self._update_occupancy()
+
+    def generate_pseudo_legal_moves(self, captures_only=False):
+        """Moves following the piece rules in pieces.py, before the king-safety test."""
+        moves = []
+        us = self.side
+        them = us ^ 1
+        pieces = self.pieces
+        own = self.occupancy[us]
+        enemy = self.occupancy[them]
+        occupied = own | enemy
+        targets_mask = enemy if captures_only else ~own
+        base = us * 6
+
+        # Pawns
+        forward = -8 if us == WHITE else 8
+        start_row = 6 if us == WHITE else 1
+        promotion_row = 0 if us == WHITE else 7
+        ep_bit = 1 << self.en_passant if self.en_passant is not None else 0
+        for sq in iter_bits(pieces[base + PAWN]):
+            targets = PAWN_ATTACKS[us][sq] & (enemy | ep_bit)
+            if not captures_only:
+                one = sq + forward
+                if not occupied & (1 << one):
+                    targets |= 1 << one
+                    if sq // 8 == start_row and not occupied & (1 << (one + forward)):
+                        targets |= 1 << (one + forward)
+            for to_sq in iter_bits(targets):
+                if to_sq // 8 == promotion_row:
+                    for promotion, _ in PROMOTIONS:
+                        moves.append((sq, to_sq, promotion))
+                else:
+                    moves.append((sq, to_sq, None))
+
+        for sq in iter_bits(pieces[base + KNIGHT]):
+            for to_sq in iter_bits(KNIGHT_ATTACKS[sq] & targets_mask):
+                moves.append((sq, to_sq, None))
+        for sq in iter_bits(pieces[base + BISHOP]):
+            for to_sq in iter_bits(slider_attacks(sq, occupied, BISHOP_DIRECTIONS) & targets_mask):
+                moves.append((sq, to_sq, None))
+        for sq in iter_bits(pieces[base + ROOK]):
+            for to_sq in iter_bits(slider_attacks(sq, occupied, ROOK_DIRECTIONS) & targets_mask):
+                moves.append((sq, to_sq, None))
+        for sq in iter_bits(pieces[base + QUEEN]):
+            attacks = slider_attacks(sq, occupied, BISHOP_DIRECTIONS) | slider_attacks(sq, occupied, ROOK_DIRECTIONS)
+            for to_sq in iter_bits(attacks & targets_mask):
+                moves.append((sq, to_sq, None))
+
+        king = pieces[base + KING]
+        if king:
+            sq = king.bit_length() - 1
+            for to_sq in iter_bits(KING_ATTACKS[sq] & targets_mask):
+                moves.append((sq, to_sq, None))
+            if not captures_only:
+                moves.extend(self._castling_moves(sq, occupied))
+        return moves
+
+    def _castling_moves(self, king_sq, occupied):
+        us = self.side
+        them = us ^ 1
+        kingside, queenside = (WHITE_KINGSIDE, WHITE_QUEENSIDE) if us == WHITE else (BLACK_KINGSIDE, BLACK_QUEENSIDE)
+        moves = []
+        if not self.castling & (kingside | queenside) or self.is_attacked(king_sq, them):
+            return moves
+        if (self.castling & kingside and not occupied & ((1 << (king_sq + 1)) | (1 << (king_sq + 2)))
+                and not self.is_attacked(king_sq + 1, them) and not self.is_attacked(king_sq + 2, them)):
+            moves.append((king_sq, king_sq + 2, None))
+        if (self.castling & queenside
+                and not occupied & ((1 << (king_sq - 1)) | (1 << (king_sq - 2)) | (1 << (king_sq - 3)))
+                and not self.is_attacked(king_sq - 1, them) and not self.is_attacked(king_sq - 2, them)):
+            moves.append((king_sq, king_sq - 2, None))
+        return moves
+
+    def generate_legal_moves(self, captures_only=False):
+        """Pseudo-legal moves that don't leave our own king attacked."""
+        us = self.side
+        legal = []
+        for move in self.generate_pseudo_legal_moves(captures_only):
+            self.make_move(move)
+            if not self.in_check(us):
+                legal.append(move)
+            self.unmake_move()
+        return legal
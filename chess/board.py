@@ -1,5 +1,13 @@
 import copy
 from chess.pieces import Pawn, Rook, Knight, Bishop, Queen, King
+from chess.attacks import (KNIGHT_SQUARES, KING_SQUARES, PAWN_ATTACKER_SQUARES, PAWN_ATTACK_SQUARES,
+                           ROOK_RAYS, BISHOP_RAYS)
+from chess.evaluation import PIECE_SCORES
+from chess.zobrist import (piece_key, SIDE_KEY, CASTLING_KEYS, EN_PASSANT_KEYS,
+                           WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE)
+
+FEN_PIECES = {'p': Pawn, 'r': Rook, 'n': Knight, 'b': Bishop, 'q': Queen, 'k': King}
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
 
 class Board:
     """Represents the 8x8 chess board and holds piece positions."""
@@ -7,6 +15,97 @@ class Board:
         self.grid = [[None for _ in range(8)] for _ in range(8)]
         self._setup_pieces()
         self.en_passant_target = None
+        self.side_to_move = 'white'
+        # Half-moves since the last capture or pawn move (the fifty-move rule counter)
+        self.halfmove_clock = 0
+        self._index_pieces()
+        self.zobrist_key = self.compute_zobrist_key()
+
+    @classmethod
+    def from_fen(cls, fen):
+        """Set up a board from a FEN string.
+
+        Castling rights become has_moved flags on the king and rooks, and pawns
+        off their starting rank are marked as moved. The fullmove number is
+        not kept on the board; Game.load_fen reads it.
+        """
+        fields = fen.split()
+        if len(fields) < 4:
+            raise ValueError(f"Invalid FEN '{fen}'")
+        placement, side, castling, en_passant = fields[:4]
+        ranks = placement.split('/')
+        if len(ranks) != 8 or side not in ('w', 'b'):
+            raise ValueError(f"Invalid FEN '{fen}'")
+        
+        board = cls.__new__(cls)
+        board.grid = [[None for _ in range(8)] for _ in range(8)]
+        for r, rank in enumerate(ranks):
+            c = 0
+            for char in rank:
+                if char.isdigit():
+                    c += int(char)
+                    continue
+                if char.lower() not in FEN_PIECES or c > 7:
+                    raise ValueError(f"Invalid FEN '{fen}'")
+                color = 'white' if char.isupper() else 'black'
+                piece = FEN_PIECES[char.lower()](color, (r, c))
+                if isinstance(piece, Pawn):
+                    piece.has_moved = r != (6 if color == 'white' else 1)
+                elif isinstance(piece, (King, Rook)):
+                    piece.has_moved = True
+                board.grid[r][c] = piece
+                c += 1
+            if c != 8:
+                raise ValueError(f"Invalid FEN '{fen}'")
+        
+        for row, color, kingside, queenside in ((7, 'white', 'K', 'Q'), (0, 'black', 'k', 'q')):
+            king = board.grid[row][4]
+            if not (isinstance(king, King) and king.color == color):
+                continue
+            for col, right in ((7, kingside), (0, queenside)):
+                rook = board.grid[row][col]
+                if right in castling and isinstance(rook, Rook) and rook.color == color:
+                    king.has_moved = False
+                    rook.has_moved = False
+        
+        board.en_passant_target = None
+        if en_passant != '-':
+            if len(en_passant) != 2 or en_passant[0] not in 'abcdefgh' or en_passant[1] not in '36':
+                raise ValueError(f"Invalid FEN '{fen}'")
+            board.en_passant_target = (8 - int(en_passant[1]), ord(en_passant[0]) - ord('a'))
+        board.side_to_move = 'white' if side == 'w' else 'black'
+        board.halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+        board._index_pieces()
+        board.zobrist_key = board.compute_zobrist_key()
+        return board
+
+    def to_fen(self, fullmove_number=1):
+        """The position as a FEN string; castling rights come from has_moved."""
+        ranks = []
+        for row in self.grid:
+            rank = ''
+            empty = 0
+            for piece in row:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                letter = next(char for char, cls in FEN_PIECES.items() if isinstance(piece, cls))
+                rank += letter.upper() if piece.color == 'white' else letter
+            ranks.append(rank + (str(empty) if empty else ''))
+        
+        rights = self.castling_rights()
+        castling = ''.join(char for char, bit in (('K', WHITE_KINGSIDE), ('Q', WHITE_QUEENSIDE),
+                                                  ('k', BLACK_KINGSIDE), ('q', BLACK_QUEENSIDE))
+                           if rights & bit) or '-'
+        en_passant = '-'
+        if self.en_passant_target:
+            row, col = self.en_passant_target
+            en_passant = chr(ord('a') + col) + str(8 - row)
+        return (f"{'/'.join(ranks)} {self.side_to_move[0]} {castling} {en_passant} "
+                f"{self.halfmove_clock} {fullmove_number}")
 
     def _setup_pieces(self):
         for col in range(8):
@@ -29,6 +128,39 @@ class Board:
         self.grid[0][4] = King('black', (0, 4))
         self.grid[7][4] = King('white', (7, 4))
 
+    def _index_pieces(self):
+        """Rebuild the per-color piece lists, king squares and evaluation totals from the grid."""
+        self.piece_lists = {'white': [], 'black': []}
+        self.king_positions = {'white': None, 'black': None}
+        # Material, middlegame and endgame piece-square totals per color, and the game
+        # phase. move_piece/unmake_move keep these up to date.
+        self.material = {'white': 0, 'black': 0}
+        self.piece_square_mg = {'white': 0, 'black': 0}
+        self.piece_square_eg = {'white': 0, 'black': 0}
+        self.phase = 0
+        # Zobrist key of the pawns alone, for caching pawn-structure scores
+        self.pawn_key = 0
+        for r in range(8):
+            for c in range(8):
+                piece = self.grid[r][c]
+                if piece:
+                    self.piece_lists[piece.color].append(piece)
+                    if isinstance(piece, King):
+                        self.king_positions[piece.color] = (r, c)
+                    elif isinstance(piece, Pawn):
+                        self.pawn_key ^= piece_key(piece, (r, c))
+                    self._add_score(piece, (r, c), 1)
+
+    def _add_score(self, piece, pos, sign):
+        """Add (sign=1) or remove (sign=-1) a piece's share of the evaluation totals."""
+        color = piece.color
+        value, phase, mg_table, eg_table = PIECE_SCORES[color][piece.__class__]
+        index = pos[0] * 8 + pos[1]
+        self.material[color] += sign * value
+        self.piece_square_mg[color] += sign * mg_table[index]
+        self.piece_square_eg[color] += sign * eg_table[index]
+        self.phase += sign * phase
+
     def is_in_bounds(self, pos):
         r, c = pos
         return 0 <= r < 8 and 0 <= c < 8
@@ -37,24 +169,78 @@ class Board:
         r, c = pos
         return self.grid[r][c]
 
+    def castling_rights(self):
+        """Bitmask of the castling rights still available, derived from has_moved."""
+        rights = 0
+        for row, color, kingside, queenside in ((7, 'white', WHITE_KINGSIDE, WHITE_QUEENSIDE),
+                                                (0, 'black', BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            king = self.grid[row][4]
+            if not (isinstance(king, King) and king.color == color and not king.has_moved):
+                continue
+            rook = self.grid[row][7]
+            if isinstance(rook, Rook) and rook.color == color and not rook.has_moved:
+                rights |= kingside
+            rook = self.grid[row][0]
+            if isinstance(rook, Rook) and rook.color == color and not rook.has_moved:
+                rights |= queenside
+        return rights
+
+    def compute_zobrist_key(self):
+        """Compute the 64-bit Zobrist key of the position from scratch."""
+        key = 0
+        for r in range(8):
+            for c in range(8):
+                piece = self.grid[r][c]
+                if piece:
+                    key ^= piece_key(piece, (r, c))
+        if self.side_to_move == 'black':
+            key ^= SIDE_KEY
+        key ^= CASTLING_KEYS[self.castling_rights()]
+        if self.en_passant_target:
+            key ^= EN_PASSANT_KEYS[self.en_passant_target[1]]
+        return key
+
     def move_piece(self, from_pos, to_pos, promotion_piece=None):
         piece = self.get_piece(from_pos)
         if not piece:
             return False
         captured_piece = self.get_piece(to_pos)
+        captured_pos = to_pos
         previous_en_passant = self.en_passant_target
+        previous_hash = self.zobrist_key
+        previous_pawn_key = self.pawn_key
+        previous_halfmove_clock = self.halfmove_clock
+        previous_rights = self.castling_rights()
+        previous_scores = (self.material['white'], self.material['black'],
+                           self.piece_square_mg['white'], self.piece_square_mg['black'],
+                           self.piece_square_eg['white'], self.piece_square_eg['black'], self.phase)
+        had_moved = piece.has_moved
         self.en_passant_target = None
+        key = previous_hash ^ piece_key(piece, from_pos)
+        if previous_en_passant:
+            key ^= EN_PASSANT_KEYS[previous_en_passant[1]]
         
-        if isinstance(piece, Pawn) and to_pos == self.en_passant_target:
+        if isinstance(piece, Pawn) and to_pos == previous_en_passant:
             captured_pos = (from_pos[0], to_pos[1])
             captured_piece = self.grid[captured_pos[0]][captured_pos[1]]
             self.grid[captured_pos[0]][captured_pos[1]] = None
+        captured_index = None
+        if captured_piece:
+            key ^= piece_key(captured_piece, captured_pos)
+            if isinstance(captured_piece, Pawn):
+                self.pawn_key ^= piece_key(captured_piece, captured_pos)
+            self._add_score(captured_piece, captured_pos, -1)
+            captured_list = self.piece_lists[captured_piece.color]
+            captured_index = captured_list.index(captured_piece)
+            del captured_list[captured_index]
         
         if isinstance(piece, Pawn) and abs(from_pos[0] - to_pos[0]) == 2:
             direction = -1 if piece.color == 'white' else 1
             self.en_passant_target = (to_pos[0] - direction, to_pos[1])
+            key ^= EN_PASSANT_KEYS[to_pos[1]]
         
         rook_move = None
+        rook_had_moved = False
         if isinstance(piece, King) and abs(from_pos[1] - to_pos[1]) == 2:
             if to_pos[1] > from_pos[1]:
                 rook_from = (from_pos[0], 7)
@@ -63,15 +249,22 @@ class Board:
                 rook_from = (from_pos[0], 0)
                 rook_to = (from_pos[0], to_pos[1] + 1)
             rook = self.get_piece(rook_from)
+            rook_had_moved = rook.has_moved
             self.grid[rook_to[0]][rook_to[1]] = rook
             self.grid[rook_from[0]][rook_from[1]] = None
             rook.move(rook_to)
             rook_move = (rook_from, rook_to, rook)
+            key ^= piece_key(rook, rook_from) ^ piece_key(rook, rook_to)
+            self._add_score(rook, rook_from, -1)
+            self._add_score(rook, rook_to, 1)
         
         self.grid[to_pos[0]][to_pos[1]] = piece
         self.grid[from_pos[0]][from_pos[1]] = None
         original_piece = piece
         piece.move(to_pos)
+        if isinstance(piece, King):
+            self.king_positions[piece.color] = to_pos
+        self._add_score(piece, from_pos, -1)
         
         promoted_piece = None
         if isinstance(piece, Pawn) and ((piece.color == 'white' and to_pos[0] == 0) or (piece.color == 'black' and to_pos[0] == 7)):
@@ -87,62 +280,293 @@ class Board:
             else:
                 self.grid[to_pos[0]][to_pos[1]] = Queen(piece.color, to_pos)
             promoted_piece = self.grid[to_pos[0]][to_pos[1]]
+            own_list = self.piece_lists[piece.color]
+            own_list[own_list.index(piece)] = promoted_piece
+        self._add_score(self.grid[to_pos[0]][to_pos[1]], to_pos, 1)
+        if isinstance(piece, Pawn):
+            self.pawn_key ^= piece_key(piece, from_pos)
+            if not promoted_piece:
+                self.pawn_key ^= piece_key(piece, to_pos)
+        
+        key ^= piece_key(self.grid[to_pos[0]][to_pos[1]], to_pos)
+        key ^= SIDE_KEY ^ CASTLING_KEYS[previous_rights] ^ CASTLING_KEYS[self.castling_rights()]
+        self.zobrist_key = key
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+        self.halfmove_clock = 0 if isinstance(piece, Pawn) or captured_piece else self.halfmove_clock + 1
         
         return {
             'from_pos': from_pos,
             'to_pos': to_pos,
             'original_piece': original_piece,
             'captured_piece': captured_piece,
+            'captured_pos': captured_pos,
+            'captured_index': captured_index,
             'promotion': promoted_piece,
             'castling': rook_move,
-            'previous_en_passant': previous_en_passant
+            'previous_en_passant': previous_en_passant,
+            'had_moved': had_moved,
+            'rook_had_moved': rook_had_moved,
+            'previous_hash': previous_hash,
+            'previous_pawn_key': previous_pawn_key,
+            'previous_halfmove_clock': previous_halfmove_clock,
+            'previous_scores': previous_scores
         }
 
+    def make_move(self, from_pos, to_pos, promotion_piece=None):
+        """Play a move in place and return the record needed to take it back."""
+        return self.move_piece(from_pos, to_pos, promotion_piece)
+
+    def unmake_move(self, move):
+        """Restore the position from before the move described by `move`."""
+        from_pos = move['from_pos']
+        to_pos = move['to_pos']
+        piece = move['original_piece']
+        
+        # The promoted piece (if any) simply disappears; the pawn comes back
+        self.grid[to_pos[0]][to_pos[1]] = None
+        self.grid[from_pos[0]][from_pos[1]] = piece
+        piece.position = from_pos
+        piece.has_moved = move['had_moved']
+        if move['promotion']:
+            own_list = self.piece_lists[piece.color]
+            own_list[own_list.index(move['promotion'])] = piece
+        elif isinstance(piece, King):
+            self.king_positions[piece.color] = from_pos
+        
+        captured_piece = move['captured_piece']
+        if captured_piece:
+            captured_pos = move['captured_pos']
+            self.grid[captured_pos[0]][captured_pos[1]] = captured_piece
+            self.piece_lists[captured_piece.color].insert(move['captured_index'], captured_piece)
+        
+        if move['castling']:
+            rook_from, rook_to, rook = move['castling']
+            self.grid[rook_to[0]][rook_to[1]] = None
+            self.grid[rook_from[0]][rook_from[1]] = rook
+            rook.position = rook_from
+            rook.has_moved = move['rook_had_moved']
+        
+        self.en_passant_target = move['previous_en_passant']
+        self.zobrist_key = move['previous_hash']
+        self.pawn_key = move['previous_pawn_key']
+        self.halfmove_clock = move['previous_halfmove_clock']
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+        (self.material['white'], self.material['black'],
+         self.piece_square_mg['white'], self.piece_square_mg['black'],
+         self.piece_square_eg['white'], self.piece_square_eg['black'], self.phase) = move['previous_scores']
+
+    def make_null_move(self):
+        """Pass the turn without moving a piece; returns the record for unmake_null_move."""
+        move = {'previous_en_passant': self.en_passant_target, 'previous_hash': self.zobrist_key}
+        key = self.zobrist_key ^ SIDE_KEY
+        if self.en_passant_target:
+            key ^= EN_PASSANT_KEYS[self.en_passant_target[1]]
+        self.en_passant_target = None
+        self.zobrist_key = key
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+        return move
+
+    def unmake_null_move(self, move):
+        self.en_passant_target = move['previous_en_passant']
+        self.zobrist_key = move['previous_hash']
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+
     def is_under_attack(self, pos, attacker_color, ignore_king=False):
-        for r in range(8):
-            for c in range(8):
-                piece = self.grid[r][c]
-                if piece and piece.color == attacker_color and not (ignore_king and isinstance(piece, King)):
-                    if isinstance(piece, Pawn):
-                        row, col = piece.position
-                        direction = -1 if piece.color == 'white' else 1
-                        attack_positions = [(row + direction, col - 1), (row + direction, col + 1)]
-                        if pos in attack_positions and self.is_in_bounds(pos):
-                            return True
-                    elif isinstance(piece, Knight):
-                        row, col = piece.position
-                        knight_moves = [(2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1), (-1, -2), (1, -2), (2, -1)]
-                        for dr, dc in knight_moves:
-                            if (row + dr, col + dc) == pos:
-                                return True
-                    else:
-                        if self._is_attacked_by_sliding_piece(piece, pos):
-                            return True
+        grid = self.grid
+        r, c = pos
+        for pr, pc in PAWN_ATTACKER_SQUARES[attacker_color][r][c]:
+            piece = grid[pr][pc]
+            if piece and piece.color == attacker_color and isinstance(piece, Pawn):
+                return True
+        for kr, kc in KNIGHT_SQUARES[r][c]:
+            piece = grid[kr][kc]
+            if piece and piece.color == attacker_color and isinstance(piece, Knight):
+                return True
+        if not ignore_king:
+            for kr, kc in KING_SQUARES[r][c]:
+                piece = grid[kr][kc]
+                if piece and piece.color == attacker_color and isinstance(piece, King):
+                    return True
+        for ray in ROOK_RAYS[r][c]:
+            for rr, rc in ray:
+                piece = grid[rr][rc]
+                if piece:
+                    if piece.color == attacker_color and isinstance(piece, (Rook, Queen)):
+                        return True
+                    break
+        for ray in BISHOP_RAYS[r][c]:
+            for rr, rc in ray:
+                piece = grid[rr][rc]
+                if piece:
+                    if piece.color == attacker_color and isinstance(piece, (Bishop, Queen)):
+                        return True
+                    break
         return False
 
     def is_square_attacked(self, pos, attacker_color):
         return self.is_under_attack(pos, attacker_color, ignore_king=True)
 
-    def _is_attacked_by_sliding_piece(self, piece, target_pos):
-        piece_type = piece.__class__.__name__
-        piece_pos = piece.position
-        is_rook_attack = piece_type in ['Rook', 'Queen'] and (piece_pos[0] == target_pos[0] or piece_pos[1] == target_pos[1])
-        is_bishop_attack = piece_type in ['Bishop', 'Queen'] and abs(piece_pos[0] - target_pos[0]) == abs(piece_pos[1] - target_pos[1])
-        if not (is_rook_attack or is_bishop_attack):
-            return False
-        row_step = 0 if piece_pos[0] == target_pos[0] else (1 if target_pos[0] > piece_pos[0] else -1)
-        col_step = 0 if piece_pos[1] == target_pos[1] else (1 if target_pos[1] > piece_pos[1] else -1)
-        current_row, current_col = piece_pos
-        while True:
-            current_row += row_step
-            current_col += col_step
-            if (current_row, current_col) == target_pos:
-                return True
-            if self.is_in_bounds((current_row, current_col)) and self.grid[current_row][current_col] is not None:
-                return False
+    def attackers_of(self, pos, color, removed=()):
+        """Return the positions of every piece of `color` that attacks `pos`.
+
+        Squares in `removed` are treated as empty, so sliders behind a piece
+        that has already been exchanged off show up as attackers (x-rays).
+        """
+        grid = self.grid
+        r, c = pos
+        attackers = []
+        for pr, pc in PAWN_ATTACKER_SQUARES[color][r][c]:
+            piece = grid[pr][pc]
+            if piece and piece.color == color and isinstance(piece, Pawn) and (pr, pc) not in removed:
+                attackers.append((pr, pc))
+        for kr, kc in KNIGHT_SQUARES[r][c]:
+            piece = grid[kr][kc]
+            if piece and piece.color == color and isinstance(piece, Knight) and (kr, kc) not in removed:
+                attackers.append((kr, kc))
+        for ray in BISHOP_RAYS[r][c]:
+            for rr, rc in ray:
+                piece = grid[rr][rc]
+                if piece and (rr, rc) not in removed:
+                    if piece.color == color and isinstance(piece, (Bishop, Queen)):
+                        attackers.append((rr, rc))
+                    break
+        for ray in ROOK_RAYS[r][c]:
+            for rr, rc in ray:
+                piece = grid[rr][rc]
+                if piece and (rr, rc) not in removed:
+                    if piece.color == color and isinstance(piece, (Rook, Queen)):
+                        attackers.append((rr, rc))
+                    break
+        for kr, kc in KING_SQUARES[r][c]:
+            piece = grid[kr][kc]
+            if piece and piece.color == color and isinstance(piece, King) and (kr, kc) not in removed:
+                attackers.append((kr, kc))
+        return attackers
+
+    def attack_map(self, color):
+        """Return the set of squares `color` attacks and its piece mobility.
+
+        Mobility counts the squares each knight, bishop, rook and queen
+        attacks that aren't occupied by its own side (pseudo-legal moves).
+        """
+        grid = self.grid
+        attacked = set()
+        mobility = 0
+        for piece in self.piece_lists[color]:
+            r, c = piece.position
+            if isinstance(piece, Pawn):
+                attacked.update(PAWN_ATTACK_SQUARES[color][r][c])
+                continue
+            if isinstance(piece, King):
+                attacked.update(KING_SQUARES[r][c])
+                continue
+            if isinstance(piece, Knight):
+                targets = KNIGHT_SQUARES[r][c]
+            else:
+                targets = []
+                rays = ()
+                if isinstance(piece, (Rook, Queen)):
+                    rays += ROOK_RAYS[r][c]
+                if isinstance(piece, (Bishop, Queen)):
+                    rays += BISHOP_RAYS[r][c]
+                for ray in rays:
+                    for square in ray:
+                        targets.append(square)
+                        if grid[square[0]][square[1]]:
+                            break
+            for tr, tc in targets:
+                attacked.add((tr, tc))
+                target = grid[tr][tc]
+                if not target or target.color != color:
+                    mobility += 1
+        return attacked, mobility
+
+    def pinned_pieces(self, color):
+        """Map each pinned piece of `color` to the squares it may still move to.
+
+        A pinned piece can only move along the line between its king and the
+        pinning slider, capturing the pinner included.
+        """
+        pins = {}
+        king_pos = self.king_positions[color]
+        if not king_pos:
+            return pins
+        grid = self.grid
+        r, c = king_pos
+        for rays, sliders in ((ROOK_RAYS[r][c], (Rook, Queen)), (BISHOP_RAYS[r][c], (Bishop, Queen))):
+            for ray in rays:
+                shield = None
+                for i, (rr, rc) in enumerate(ray):
+                    piece = grid[rr][rc]
+                    if not piece:
+                        continue
+                    if shield is None and piece.color == color:
+                        shield = (rr, rc)
+                        continue
+                    if shield is not None and piece.color != color and isinstance(piece, sliders):
+                        pins[shield] = set(ray[:i + 1])
+                    break
+        return pins
+
+    def check_evasion_squares(self, color, checkers):
+        """Squares a non-king piece can move to in order to answer a single check."""
+        checker_pos = checkers[0]
+        king_pos = self.king_positions[color]
+        if isinstance(self.get_piece(checker_pos), (Rook, Bishop, Queen)):
+            r, c = king_pos
+            for ray in ROOK_RAYS[r][c] + BISHOP_RAYS[r][c]:
+                if checker_pos in ray:
+                    return set(ray[:ray.index(checker_pos) + 1])
+        return {checker_pos}
+
+    def generate_legal_moves(self, color, captures_only=False):
+        """Return every legal (from_pos, to_pos, promotion) move for `color`.
+
+        Pins and checks are worked out once for the position, so most moves are
+        accepted without being played. Only king moves and en passant captures,
+        whose legality depends on more than the pin/check lines, are tested by
+        making and unmaking them.
+        """
+        legal_moves = []
+        opponent_color = 'black' if color == 'white' else 'white'
+        king_pos = self.king_positions[color]
+        checkers = self.attackers_of(king_pos, opponent_color) if king_pos else []
+        pins = self.pinned_pieces(color)
+        evasions = self.check_evasion_squares(color, checkers) if len(checkers) == 1 else None
+        promotion_row = 0 if color == 'white' else 7
+        
+        for piece in list(self.piece_lists[color]):
+            from_pos = piece.position
+            is_king = isinstance(piece, King)
+            is_pawn = isinstance(piece, Pawn)
+            if len(checkers) > 1 and not is_king:
+                continue
+            pin_line = pins.get(from_pos)
+            for to_pos in piece.legal_moves(self):
+                is_en_passant = is_pawn and to_pos == self.en_passant_target
+                if captures_only and not is_en_passant and self.grid[to_pos[0]][to_pos[1]] is None:
+                    continue
+                if is_king or is_en_passant:
+                    move_info = self.make_move(from_pos, to_pos)
+                    safe = king_pos is None or not self.is_under_attack(self.king_positions[color], opponent_color)
+                    self.unmake_move(move_info)
+                    if not safe:
+                        continue
+                else:
+                    if evasions is not None and to_pos not in evasions:
+                        continue
+                    if pin_line is not None and to_pos not in pin_line:
+                        continue
+                if is_pawn and to_pos[0] == promotion_row:
+                    for promotion in ['Q', 'R', 'B', 'N']:
+                        legal_moves.append((from_pos, to_pos, promotion))
+                else:
+                    legal_moves.append((from_pos, to_pos, None))
+        return legal_moves
 
     def copy(self):
-        new_board = Board()
+        # Bypass __init__ so we don't set up the starting position just to overwrite it
+        new_board = Board.__new__(Board)
         new_board.grid = [[None for _ in range(8)] for _ in range(8)]
         for r in range(8):
             for c in range(8):
@@ -163,4 +587,8 @@ class Board:
                     new_piece.has_moved = piece.has_moved
                     new_board.grid[r][c] = new_piece
         new_board.en_passant_target = self.en_passant_target
+        new_board.side_to_move = self.side_to_move
+        new_board.halfmove_clock = self.halfmove_clock
+        new_board.zobrist_key = self.zobrist_key
+        new_board._index_pieces()
         return new_board 
\ No newline at end of file
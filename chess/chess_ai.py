@@ -1,18 +1,66 @@
+import threading
 import time
 from chess.pieces import Pawn, Rook, Knight, Bishop, Queen, King
+from chess.bitboard import BitboardPosition, PIECE_NAMES, ROOK, QUEEN, KING, iter_bits, to_position
+from chess.evaluation import (PIECE_VALUES, POSITION_VALUES, KING_ENDGAME_VALUES, CLASS_VALUES,
+                              TOTAL_PHASE, ENDGAME_PHASE, evaluate_pawns)
+from chess.transposition import create_transposition_table, EvaluationCache, EXACT, UPPER_BOUND, LOWER_BOUND
+
+class SearchAborted(Exception):
+    """Raised inside the search tree when the search has been asked to stop."""
+
 
 class ChessAI:
     """AI opponent for the chess game using minimax with alpha-beta pruning."""
-    def __init__(self, color, search_depth=3):
+    def __init__(self, color, search_depth=3, backend='board', tt_size_mb=16, tt_layout='packed',
+                 search_mode='minimax'):
         self.color = color
         self.opponent_color = 'black' if color == 'white' else 'white'
         self.search_depth = search_depth
         self.max_depth = search_depth + 3  # Maximum depth for complex positions
         self.min_depth = max(1, search_depth - 1)  # Minimum depth for simple positions
+        # False searches every iteration to exactly its own depth, for fixed-depth searches
+        self.adaptive_depth = True
         self.quiescence_depth = 3  # Maximum depth for quiescence search
-        self.transposition_table = {}  # Store previously evaluated positions
+        # 'board' searches Board/Piece objects; 'bitboard' searches a BitboardPosition
+        self.backend = backend
+        # 'minimax' is the classic two-sided search; 'pvs' is negamax principal variation search
+        self.search_mode = search_mode
+        # Half-width of the aspiration window PVS opens around the previous score
+        self.aspiration_window = 50
+        # Print search progress to stdout
+        self.verbose = True
+        # Worker processes for the root-split parallel search; 1 searches in this process
+        self.workers = 1
+        self._root_split = None
+        # Set in parallel-search workers: a shared flag the parent raises to stop them,
+        # and the node count every worker adds to, checked against shared_node_limit
+        self.shared_stop = None
+        self.shared_nodes = None
+        self.shared_node_limit = None
+        self._reported_nodes = 0
+        # Selective search in PVS mode, each with its own switch
+        self.use_null_move = True
+        self.null_move_reduction = 2
+        self.use_late_move_reductions = True
+        # Quiet moves with at least this much history are not reduced
+        self.lmr_history_threshold = 500
+        self.use_futility_pruning = True
+        self.futility_margins = [0, 200, 400]  # Indexed by remaining depth
+        self.use_razoring = True
+        self.razor_margins = [0, 300, 500]
+        self.search_stats = {}
+        # Previously evaluated positions, kept from one move to the next.
+        # 'packed' fits ~12x more positions in the same memory than 'tuple'
+        self.transposition_table = create_transposition_table(tt_size_mb, tt_layout)
+        # Scores in the table depend on the AI's color and backend; see _prepare_tables
+        self._tt_owner = None
+        # Static evaluations by Zobrist key, and pawn-structure scores by pawn key
+        self.eval_cache = EvaluationCache(4)
+        self.pawn_cache = EvaluationCache(1)
+        self._eval_owner = None
         self.nodes_evaluated = 0  # For performance tracking
-        self.piece_values = {'Pawn': 100, 'Knight': 300, 'Bishop': 320, 'Rook': 500, 'Queen': 1500, 'King': 10000}
+        self.piece_values = PIECE_VALUES
         # Killer move heuristic - store moves that caused beta cutoffs
         self.killer_moves = [[None, None] for _ in range(self.max_depth + 1)]
         # History heuristic - track effectiveness of each move across positions
@@ -21,23 +69,202 @@ class ChessAI:
         self.pv_table = {}
         # Previous iteration's evaluation for adaptive depth
         self.previous_eval = 0
-        self.position_values = {
-            'Pawn': [[0,0,0,0,0,0,0,0],[50,50,50,50,50,50,50,50],[10,10,20,30,30,20,10,10],[5,5,10,25,25,10,5,5],[0,0,0,20,20,0,0,0],[5,-5,-10,0,0,-10,-5,5],[5,10,10,-20,-20,10,10,5],[0,0,0,0,0,0,0,0]],
-            'Knight': [[-50,-40,-30,-30,-30,-30,-40,-50],[-40,-20,0,0,0,0,-20,-40],[-30,0,10,15,15,10,0,-30],[-30,5,15,20,20,15,5,-30],[-30,0,15,20,20,15,0,-30],[-30,5,10,15,15,10,5,-30],[-40,-20,0,5,5,0,-20,-40],[-50,-40,-30,-30,-30,-30,-40,-50]],
-            'Bishop': [[-20,-10,-10,-10,-10,-10,-10,-20],[-10,0,0,0,0,0,0,-10],[-10,0,10,10,10,10,0,-10],[-10,5,5,10,10,5,5,-10],[-10,0,5,10,10,5,0,-10],[-10,5,5,5,5,5,5,-10],[-10,0,5,0,0,5,0,-10],[-20,-10,-10,-10,-10,-10,-10,-20]],
-            'Rook': [[0,0,0,0,0,0,0,0],[5,10,10,10,10,10,10,5],[-5,0,0,0,0,0,0,-5],[-5,0,0,0,0,0,0,-5],[-5,0,0,0,0,0,0,-5],[-5,0,0,0,0,0,0,-5],[-5,0,0,0,0,0,0,-5],[0,0,0,5,5,0,0,0]],
-            'Queen': [[-20,-10,-10,-5,-5,-10,-10,-20],[-10,0,0,0,0,0,0,-10],[-10,0,5,5,5,5,0,-10],[-5,0,5,5,5,5,0,-5],[0,0,5,5,5,5,0,-5],[-10,5,5,5,5,5,0,-10],[-10,0,5,0,0,0,0,-10],[-20,-10,-10,-5,-5,-10,-10,-20]],
-            'King': [[-30,-40,-40,-50,-50,-40,-40,-30],[-30,-40,-40,-50,-50,-40,-40,-30],[-30,-40,-40,-50,-50,-40,-40,-30],[-30,-40,-40,-50,-50,-40,-40,-30],[-20,-30,-30,-40,-40,-30,-30,-20],[-10,-20,-20,-20,-20,-20,-20,-10],[20,20,0,0,0,0,20,20],[20,30,10,0,0,10,30,20]]
+        # Set from another thread (e.g. the GUI) to stop the search at the next node.
+        # Each search gets its own event and nothing clears it (see new_stop_event)
+        self.stop_event = threading.Event()
+        # Default time control: seconds per move, and an optional node budget per move
+        self.move_time = 5.0
+        self.node_limit = None
+        # How often (in nodes) the search looks at the clock
+        self.time_check_interval = 256
+        self._deadline = None
+        self._search_node_limit = None
+        self._soft_time_limit = None
+        # Called with a dict of depth/nodes/best move/score/time as the search progresses
+        self.progress_callback = None
+        # 'full' adds threats, defended pieces and mobility to the evaluation and checks for
+        # mate/stalemate; 'fast' is material, piece-square, king safety and pawns only
+        self.eval_profile = 'full'
+        self.position_values = POSITION_VALUES
+        self.king_endgame_values = KING_ENDGAME_VALUES
+
+    def set_color(self, color):
+        """Switch the side the AI plays, dropping anything scored from the old side's view."""
+        self.color = color
+        self.opponent_color = 'black' if color == 'white' else 'white'
+        self.transposition_table.clear()
+        self.eval_cache.clear()
+        self.history_table = {}
+        self.previous_eval = 0
+        self._tt_owner = None
+        self._eval_owner = None
+
+    def _prepare_tables(self):
+        """Age the transposition table for a new search and clear any cache whose scores no longer apply."""
+        # Minimax scores are from self.color's view, PVS and bitboard scores from the side to move
+        owner = (self.color, self.backend, self.search_mode)
+        if self._tt_owner != owner:
+            self.transposition_table.clear()
+            self._tt_owner = owner
+        self.transposition_table.new_search()
+        # Cached evaluations are from self.color's view and depend on the profile.
+        # Pawn scores are stored from white's view, so they always stay valid.
+        eval_owner = (self.color, self.eval_profile)
+        if self._eval_owner != eval_owner:
+            self.eval_cache.clear()
+            self._eval_owner = eval_owner
+        for table in (self.transposition_table, self.eval_cache, self.pawn_cache):
+            table.reset_stats()
+
+    def _reset_search_stats(self):
+        # beta_cutoffs counts fail-high nodes, first_move_cutoffs those where the first move did it
+        self.search_stats = {'beta_cutoffs': 0, 'first_move_cutoffs': 0, 'null_move_tries': 0,
+                             'null_move_cutoffs': 0, 'lmr_reductions': 0, 'lmr_researches': 0,
+                             'futility_pruned': 0, 'razor_cutoffs': 0}
+
+    def _count_cutoff(self, index):
+        self.search_stats['beta_cutoffs'] += 1
+        if index == 0:
+            self.search_stats['first_move_cutoffs'] += 1
+
+    def stats(self):
+        """Counters from the last search: nodes, pruning, and table hit rates."""
+        return {
+            'nodes': self.nodes_evaluated,
+            'search': dict(self.search_stats),
+            'transposition_table': self.transposition_table.stats(),
+            'eval_cache': self.eval_cache.stats(),
+            'pawn_cache': self.pawn_cache.stats(),
         }
-        self.king_endgame_values = [[-50,-40,-30,-20,-20,-30,-40,-50],[-30,-20,-10,0,0,-10,-20,-30],[-30,-10,20,30,30,20,-10,-30],[-30,-10,30,40,40,30,-10,-30],[-30,-10,30,40,40,30,-10,-30],[-30,-10,20,30,30,20,-10,-30],[-30,-30,0,0,0,0,-30,-30],[-50,-30,-30,-30,-30,-30,-30,-50]]
 
-    def choose_move(self, game):
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    def _print_search_stats(self, start_time):
+        # Return before building the messages: tt.used() scans the whole table
+        if not self.verbose:
+            return
+        tt = self.transposition_table
+        self._log(f"Nodes evaluated: {self.nodes_evaluated}, Time: {time.time() - start_time:.2f}s")
+        self._log(f"TT: {tt.hits}/{tt.probes} hits ({tt.stats()['hit_rate']:.1%}), "
+              f"{tt.collisions} collisions, {tt.overwrites} overwrites, {tt.used():.1%} full")
+        for name, cache in (('Eval cache', self.eval_cache), ('Pawn cache', self.pawn_cache)):
+            if cache.probes:
+                self._log(f"{name}: {cache.hits}/{cache.probes} hits ({cache.hits / cache.probes:.1%})")
+        if any(self.search_stats.values()):
+            self._log("Search: " + ", ".join(f"{name} {count}" for name, count in self.search_stats.items()))
+
+    def new_stop_event(self):
+        """Make the stop signal for the next search and return it.
+
+        A caller that runs choose_move on another thread calls this before
+        starting the thread and passes the event in, so a stop() sent before
+        the search gets going is not lost.
+        """
+        self.stop_event = threading.Event()
+        return self.stop_event
+
+    def stop(self):
+        """Ask a running search to return its best move so far as soon as possible."""
+        self.stop_event.set()
+
+    def _check_stop(self):
+        """Abort the search if it was stopped or ran out of its time or node budget."""
+        if self.stop_event.is_set():
+            raise SearchAborted()
+        if self._search_node_limit and self.nodes_evaluated >= self._search_node_limit:
+            raise SearchAborted()
+        if self.nodes_evaluated % self.time_check_interval == 0:
+            if self._deadline and time.time() >= self._deadline:
+                raise SearchAborted()
+            if self.shared_nodes is not None:
+                self._report_shared_nodes()
+            if self.shared_stop is not None and self.shared_stop.value:
+                raise SearchAborted()
+
+    def _report_shared_nodes(self):
+        """Add the nodes searched since the last report to shared_nodes; past the budget, stop every worker."""
+        with self.shared_nodes.get_lock():
+            self.shared_nodes.value += self.nodes_evaluated - self._reported_nodes
+            total = self.shared_nodes.value
+        self._reported_nodes = self.nodes_evaluated
+        if self.shared_node_limit and total >= self.shared_node_limit:
+            self.shared_stop.value = 1
+
+    def _start_clock(self, move_time=None, time_left=None, increment=0, node_limit=None):
+        """Work out this move's time and node budget and start timing the search.
+
+        move_time is a fixed number of seconds for the move. time_left and
+        increment describe a game clock, of which we spend a fraction per
+        move. With neither, self.move_time is used; a node_limit of None
+        falls back to self.node_limit.
+        """
+        start_time = time.time()
+        if move_time is None and time_left is not None:
+            # Assume ~30 more moves, use most of the increment, and never risk the flag
+            move_time = time_left / 30.0 + increment * 0.8
+            move_time = max(0.05, min(move_time, time_left - 0.1))
+        elif move_time is None:
+            move_time = self.move_time
+        self._deadline = start_time + move_time if move_time else None
+        # Don't start an iteration that probably can't finish before the deadline
+        self._soft_time_limit = move_time * 0.5 if move_time else None
+        self._search_node_limit = node_limit if node_limit is not None else self.node_limit
+        return start_time
+
+    def _out_of_time(self, start_time):
+        return self._soft_time_limit is not None and time.time() - start_time > self._soft_time_limit
+
+    def _report_progress(self, depth, best_move, score, start_time, completed=False):
+        """Tell progress_callback about a new best root move; completed marks the end of an iteration."""
+        if self.progress_callback:
+            self.progress_callback({
+                'depth': depth,
+                'completed': completed,
+                'nodes': self.nodes_evaluated,
+                'best_move': best_move,
+                'score': score,
+                'time': time.time() - start_time
+            })
+
+    def choose_move(self, game, move_time=None, time_left=None, increment=0, node_limit=None, depth=None,
+                    stop_event=None):
+        """Pick a move for the side to move within the given time control.
+
+        The search is iterative deepening; if it is stopped or runs out of time
+        or nodes part-way through an iteration, the best move of the last
+        completed iteration is returned. depth replaces search_depth for
+        this search only. stop_event comes from new_stop_event(); without
+        one the search gets a fresh event.
+        """
+        self.stop_event = stop_event if stop_event is not None else threading.Event()
+        if depth is None:
+            return self._choose_move(game, move_time, time_left, increment, node_limit)
+        # A requested depth is searched exactly, not stretched by adaptive depth
+        saved_depths = (self.search_depth, self.max_depth, self.adaptive_depth)
+        self.search_depth = depth
+        self.max_depth = max(self.max_depth, depth)
+        self.adaptive_depth = False
+        try:
+            return self._choose_move(game, move_time, time_left, increment, node_limit)
+        finally:
+            self.search_depth, self.max_depth, self.adaptive_depth = saved_depths
+
+    def _choose_move(self, game, move_time, time_left, increment, node_limit):
+        start_time = self._start_clock(move_time, time_left, increment, node_limit)
+        self._prepare_tables()
+        self._reset_search_stats()
+        if self.backend == 'bitboard':
+            return self._choose_move_bitboard(game, start_time)
+        if self.workers > 1:
+            return self._choose_move_parallel(game, start_time)
+        if self.search_mode == 'pvs':
+            return self._choose_move_pvs(game, start_time)
         self.nodes_evaluated = 0
-        self.transposition_table = {}
         # Reset killer move and history heuristic for new search
         self.killer_moves = [[None, None] for _ in range(self.max_depth + 1)]
         self.pv_table = {}
-        start_time = time.time()
         
         legal_moves = self._get_all_legal_moves(game, self.color)
         if not legal_moves:
@@ -49,11 +276,14 @@ class ChessAI:
         best_move = None
         best_score = float('-inf')
         
+        # Search on a single private copy of the game, walking the tree with make/unmake
+        game = self._copy_game(game)
+        
         # Initial PV move ordering for first iteration
         legal_moves = self._sort_moves(game, legal_moves)
         
         for current_depth in range(1, self.search_depth + 1):
-            print(f"Searching at depth {current_depth}...")
+            self._log(f"Searching at depth {current_depth}...")
             
             # Adaptive depth: adjust based on position complexity
             adaptive_depth = self._get_adaptive_depth(game, legal_moves, current_depth)
@@ -72,26 +302,34 @@ class ChessAI:
             current_best_move = None
             current_best_score = float('-inf')
             
-            for move in legal_moves:
-                from_pos, to_pos, promotion = move
-                game_copy = self._copy_game(game)
-                game_copy.play_move(from_pos, to_pos, promotion)
-                
-                # Get score from minimax
-                score = self._minimax(game_copy, adaptive_depth - 1, alpha, beta, False, 0)
-                
-                # Update best move if found
-                if score > current_best_score:
-                    current_best_score = score
-                    current_best_move = move
+            try:
+                for move in legal_moves:
+                    from_pos, to_pos, promotion = move
+                    move_info = game.make_move(from_pos, to_pos, promotion)
                     
-                    # Update history table - increase score for this move
-                    move_key = self._get_move_key(from_pos, to_pos)
-                    if move_key not in self.history_table:
-                        self.history_table[move_key] = 0
-                    self.history_table[move_key] += current_depth * current_depth
-                
-                alpha = max(alpha, current_best_score)
+                    # Get score from minimax
+                    score = self._minimax(game, adaptive_depth - 1, alpha, beta, False, 0)
+                    game.unmake_move(move_info)
+                    
+                    # Update best move if found
+                    if score > current_best_score:
+                        current_best_score = score
+                        current_best_move = move
+                        self._report_progress(current_depth, move, score, start_time)
+                        
+                        # Update history table - increase score for this move
+                        move_key = self._get_move_key(from_pos, to_pos)
+                        if move_key not in self.history_table:
+                            self.history_table[move_key] = 0
+                        self.history_table[move_key] += current_depth * current_depth
+                    
+                    alpha = max(alpha, current_best_score)
+            except SearchAborted:
+                # Keep the last completed iteration's move; fall back to this one's if there is none
+                if best_move is None:
+                    best_move = current_best_move or legal_moves[0]
+                self._log(f"Search stopped during depth {current_depth}")
+                break
             
             # Update overall best move if we completed this iteration
             if current_best_move:
@@ -102,18 +340,22 @@ class ChessAI:
                 eval_diff = abs(best_score - self.previous_eval)
                 self.previous_eval = best_score
                 
-                print(f"Depth {current_depth}: Best move {best_move}, Score: {best_score}")
+                self._log(f"Depth {current_depth}: Best move {best_move}, Score: {best_score}")
+                self._report_progress(current_depth, best_move, best_score, start_time, completed=True)
             
             # If we're running out of time or found a forced mate, break early
-            if time.time() - start_time > 5 or abs(best_score) > 90000:  # 5 second time limit
+            if self._out_of_time(start_time) or abs(best_score) > 90000:
                 break
         
         # Print statistics
-        print(f"Nodes evaluated: {self.nodes_evaluated}, Time: {time.time() - start_time:.2f}s")
+        self._print_search_stats(start_time)
         return best_move
 
     def _get_adaptive_depth(self, game, legal_moves, base_depth):
         """Enhanced adaptive depth calculation based on position complexity"""
+        if not self.adaptive_depth:
+            return base_depth
+        
         # Fewer moves = can search deeper
         move_count_factor = max(0.5, min(1.5, 10 / max(1, len(legal_moves))))
         
@@ -148,32 +390,20 @@ class ChessAI:
         
         # Debug information 
         if base_depth > 1:
-            print(f"Adaptive depth: {actual_depth} (from base {base_depth})")
+            self._log(f"Adaptive depth: {actual_depth} (from base {base_depth})")
             
         return actual_depth
         
     def _get_material_imbalance(self, board):
         """Calculate the material imbalance on the board"""
-        ai_material = 0
-        opponent_material = 0
-        
-        for r in range(8):
-            for c in range(8):
-                piece = board.grid[r][c]
-                if not piece:
-                    continue
-                    
-                piece_value = self.piece_values.get(piece.__class__.__name__, 0)
-                if piece.color == self.color:
-                    ai_material += piece_value
-                else:
-                    opponent_material += piece_value
-                    
+        ai_material = sum(self.piece_values.get(piece.__class__.__name__, 0) for piece in board.piece_lists[self.color])
+        opponent_material = sum(self.piece_values.get(piece.__class__.__name__, 0) for piece in board.piece_lists[self.opponent_color])
         return abs(ai_material - opponent_material)
 
     def _minimax(self, game, depth, alpha, beta, is_maximizing, ply):
         """Enhanced minimax implementation with alpha-beta pruning"""
         self.nodes_evaluated += 1
+        self._check_stop()
         
         # Check for immediate terminal states
         if game.in_checkmate(game.turn):
@@ -183,44 +413,46 @@ class ChessAI:
             
         # Use transposition table for position lookup
         board_hash = self._get_board_hash(game.board)
-        if board_hash in self.transposition_table and self.transposition_table[board_hash][0] >= depth:
-            stored_depth, stored_value, value_type = self.transposition_table[board_hash]
-            if value_type == 0:  # Exact value
-                return stored_value
-            elif value_type == 1 and stored_value <= alpha:  # Upper bound
-                return alpha
-            elif value_type == -1 and stored_value >= beta:  # Lower bound
-                return beta
+        entry = self.transposition_table.probe(board_hash)
+        tt_move = None
+        if entry:
+            stored_depth, stored_value, value_type, tt_move = entry
+            if stored_depth >= depth:
+                if value_type == EXACT:
+                    return stored_value
+                elif value_type == UPPER_BOUND and stored_value <= alpha:
+                    return alpha
+                elif value_type == LOWER_BOUND and stored_value >= beta:
+                    return beta
         
         # Base case: reached depth limit
         if depth <= 0:
             # Use quiescence search to handle capture sequences and avoid horizon effect
             return self._quiescence_search(game, alpha, beta, is_maximizing, 0)
             
-        # Determine whose turn it is
-        is_current_player = (game.turn == self.color) == is_maximizing
-        color = self.color if is_current_player else self.opponent_color
+        # Moves are generated for the side to move; make_move does not re-check turn order
+        color = game.turn
         
         # Get all legal moves for current position
         legal_moves = self._get_all_legal_moves(game, color)
         if not legal_moves:
             return self._evaluate_position(game)
             
-        # Sort moves using PV, killer move, and history heuristics
-        legal_moves = self._sort_moves_with_history(game, legal_moves, depth, ply)
+        # Try the TT move, PV, captures, killer moves and history-ordered quiets in stages
+        legal_moves = self._pick_moves(game, legal_moves, depth, ply, tt_move)
         
-        # Flag for transposition table
-        value_type = 0  # 0: exact, 1: upper bound, -1: lower bound
+        # The bound stored in the table depends on the window we were searched with
+        original_alpha = alpha
+        original_beta = beta
         best_move = None
         
         if is_maximizing:
             max_score = float('-inf')
-            for move in legal_moves:
+            for index, move in enumerate(legal_moves):
                 from_pos, to_pos, promotion = move
-                game_copy = self._copy_game(game)
-                game_copy.play_move(from_pos, to_pos, promotion)
-                
-                score = self._minimax(game_copy, depth - 1, alpha, beta, False, ply + 1)
+                move_info = game.make_move(from_pos, to_pos, promotion)
+                score = self._minimax(game, depth - 1, alpha, beta, False, ply + 1)
+                game.unmake_move(move_info)
                 
                 if score > max_score:
                     max_score = score
@@ -234,6 +466,7 @@ class ChessAI:
                 
                 # Beta cutoff - store killer move
                 if beta <= alpha:
+                    self._count_cutoff(index)
                     if not self._is_capture(game.board, from_pos, to_pos):
                         # Only store quiet moves as killer moves
                         self._store_killer_move(move, ply)
@@ -242,20 +475,24 @@ class ChessAI:
                     move_key = self._get_move_key(from_pos, to_pos)
                     self.history_table[move_key] = self.history_table.get(move_key, 0) + depth * depth
                     
-                    value_type = -1  # Lower bound
                     break
                     
             # Store result in transposition table
-            self.transposition_table[board_hash] = (depth, max_score, value_type)
+            if max_score <= original_alpha:
+                value_type = UPPER_BOUND
+            elif max_score >= original_beta:
+                value_type = LOWER_BOUND
+            else:
+                value_type = EXACT
+            self.transposition_table.store(board_hash, depth, max_score, value_type, best_move)
             return max_score
         else:
             min_score = float('inf')
-            for move in legal_moves:
+            for index, move in enumerate(legal_moves):
                 from_pos, to_pos, promotion = move
-                game_copy = self._copy_game(game)
-                game_copy.play_move(from_pos, to_pos, promotion)
-                
-                score = self._minimax(game_copy, depth - 1, alpha, beta, True, ply + 1)
+                move_info = game.make_move(from_pos, to_pos, promotion)
+                score = self._minimax(game, depth - 1, alpha, beta, True, ply + 1)
+                game.unmake_move(move_info)
                 
                 if score < min_score:
                     min_score = score
@@ -269,6 +506,7 @@ class ChessAI:
                 
                 # Alpha cutoff - store killer move
                 if beta <= alpha:
+                    self._count_cutoff(index)
                     if not self._is_capture(game.board, from_pos, to_pos):
                         # Only store quiet moves as killer moves
                         self._store_killer_move(move, ply)
@@ -277,120 +515,415 @@ class ChessAI:
                     move_key = self._get_move_key(from_pos, to_pos)
                     self.history_table[move_key] = self.history_table.get(move_key, 0) + depth * depth
                     
-                    value_type = 1  # Upper bound
                     break
                     
             # Store result in transposition table
-            self.transposition_table[board_hash] = (depth, min_score, value_type)
+            if min_score >= original_beta:
+                value_type = LOWER_BOUND
+            elif min_score <= original_alpha:
+                value_type = UPPER_BOUND
+            else:
+                value_type = EXACT
+            self.transposition_table.store(board_hash, depth, min_score, value_type, best_move)
             return min_score
 
-    def _get_board_hash(self, board):
-        """Create a hash of the board position for the transposition table"""
-        # Create a simplified string representation of the board
-        board_str = ""
-        for r in range(8):
-            for c in range(8):
-                piece = board.grid[r][c]
-                if piece:
-                    piece_code = piece.__class__.__name__[0].lower()
-                    if piece.__class__.__name__ == 'Knight':
-                        piece_code = 'n'
-                    if piece.color == 'white':
-                        piece_code = piece_code.upper()
-                    board_str += piece_code
+    def _choose_move_parallel(self, game, start_time):
+        """Split the root moves over self.workers processes (see chess.parallel)"""
+        # Imported here: chess.parallel imports this module
+        from chess.parallel import RootSplitSearch
+        if self._root_split is None or self._root_split.settings_key != RootSplitSearch.key_for(self):
+            self.close()
+            self._root_split = RootSplitSearch(self, self.workers)
+        self.killer_moves = [[None, None] for _ in range(self.max_depth + 1)]
+        return self._root_split.search(self, self._copy_game(game), start_time)
+
+    def principal_variation(self, board, first_move, max_length=20):
+        """The expected line starting with first_move, following best moves stored in the transposition table."""
+        board = board.copy()
+        line = []
+        move = first_move
+        seen = set()
+        while move is not None and len(line) < max_length:
+            if move not in board.generate_legal_moves(board.side_to_move):
+                break
+            line.append(move)
+            board.make_move(*move)
+            # Stop at a repetition rather than walking round a cycle of table moves
+            if board.zobrist_key in seen:
+                break
+            seen.add(board.zobrist_key)
+            move = self.transposition_table.best_move(board.zobrist_key)
+        return line
+
+    def close(self):
+        """Shut down the parallel search's worker processes, if any."""
+        if self._root_split is not None:
+            self._root_split.shutdown()
+            self._root_split = None
+
+    def _choose_move_pvs(self, game, start_time):
+        """Iterative deepening principal variation search with aspiration windows"""
+        self.nodes_evaluated = 0
+        self.killer_moves = [[None, None] for _ in range(self.max_depth + 1)]
+        self.pv_table = {}
+        
+        legal_moves = self._get_all_legal_moves(game, self.color)
+        if not legal_moves:
+            return None
+        if len(legal_moves) == 1:
+            return legal_moves[0]
+        
+        game = self._copy_game(game)
+        legal_moves = self._sort_moves(game, legal_moves)
+        best_move = None
+        best_score = float('-inf')
+        
+        for current_depth in range(1, self.search_depth + 1):
+            self._log(f"Searching at depth {current_depth}...")
+            adaptive_depth = self._get_adaptive_depth(game, legal_moves, current_depth)
+            self.pv_table = {}
+            legal_moves = self._sort_moves_with_history(game, legal_moves, current_depth)
+            
+            # Start with a narrow window around the last score and widen the side that fails
+            if current_depth > 1:
+                alpha = self.previous_eval - self.aspiration_window
+                beta = self.previous_eval + self.aspiration_window
+            else:
+                alpha = float('-inf')
+                beta = float('inf')
+            
+            try:
+                while True:
+                    score, move = self._pvs_root(game, legal_moves, adaptive_depth, alpha, beta, current_depth, start_time)
+                    if score <= alpha:
+                        self._log(f"Aspiration fail low at depth {current_depth} ({score})")
+                        alpha = float('-inf')
+                    elif score >= beta:
+                        self._log(f"Aspiration fail high at depth {current_depth} ({score})")
+                        beta = float('inf')
+                        # A fail-high move is still better than anything searched before it
+                        best_move = move
+                    else:
+                        break
+            except SearchAborted:
+                if best_move is None:
+                    best_move = legal_moves[0]
+                self._log(f"Search stopped during depth {current_depth}")
+                break
+            
+            best_move = move
+            best_score = score
+            self.previous_eval = best_score
+            self._log(f"Depth {current_depth}: Best move {best_move}, Score: {best_score}")
+            self._report_progress(current_depth, best_move, best_score, start_time, completed=True)
+            
+            if self._out_of_time(start_time) or abs(best_score) > 90000:
+                break
+        
+        self._print_search_stats(start_time)
+        return best_move
+
+    def _pvs_root(self, game, moves, depth, alpha, beta, iteration, start_time):
+        """Search the root moves inside (alpha, beta); returns (score, best move)"""
+        best_score = float('-inf')
+        best_move = None
+        for index, move in enumerate(moves):
+            from_pos, to_pos, promotion = move
+            move_info = game.make_move(from_pos, to_pos, promotion)
+            if index == 0:
+                score = -self._pvs(game, depth - 1, -beta, -alpha, 0)
+            else:
+                # Prove the move is no better than the first one with a null window
+                score = -self._pvs(game, depth - 1, -alpha - 1, -alpha, 0)
+                if alpha < score < beta:
+                    score = -self._pvs(game, depth - 1, -beta, -alpha, 0)
+            game.unmake_move(move_info)
+            
+            if score > best_score:
+                best_score = score
+                best_move = move
+                self._report_progress(iteration, move, score, start_time)
+                move_key = self._get_move_key(from_pos, to_pos)
+                self.history_table[move_key] = self.history_table.get(move_key, 0) + iteration * iteration
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best_score, best_move
+
+    def _pvs(self, game, depth, alpha, beta, ply, allow_null=True):
+        """Negamax principal variation search; scores are from the side to move"""
+        self.nodes_evaluated += 1
+        self._check_stop()
+        
+        board_hash = self._get_board_hash(game.board)
+        entry = self.transposition_table.probe(board_hash)
+        tt_move = None
+        if entry:
+            stored_depth, stored_value, value_type, tt_move = entry
+            if stored_depth >= depth:
+                if value_type == EXACT:
+                    return stored_value
+                elif value_type == UPPER_BOUND and stored_value <= alpha:
+                    return stored_value
+                elif value_type == LOWER_BOUND and stored_value >= beta:
+                    return stored_value
+        
+        turn = game.turn
+        in_check = self._king_in_check(game.board, turn)
+        legal_moves = self._get_all_legal_moves(game, turn)
+        if not legal_moves:
+            return -100000 if in_check else 0
+        if depth <= 0:
+            return self._pvs_quiescence(game, alpha, beta, 0)
+        
+        # Selective pruning only in null-window nodes, never in check or around mate scores
+        futility_value = None
+        if beta - alpha == 1 and not in_check and abs(beta) < 90000:
+            static_eval = self._evaluate_for_side_to_move(game)
+            
+            # Razoring: far below alpha near the leaves, only captures can save us
+            if self.use_razoring and depth <= 2 and static_eval + self.razor_margins[depth] <= alpha:
+                score = self._pvs_quiescence(game, alpha, beta, 0)
+                if score <= alpha:
+                    self.search_stats['razor_cutoffs'] += 1
+                    return score
+            
+            # Null move: if passing still fails high, a real move will too.
+            # Skipped in endgames and pawn endings, where passing can be the best move (zugzwang)
+            if (self.use_null_move and allow_null and depth >= 3 and static_eval >= beta
+                    and not self._is_endgame(game.board) and self._has_non_pawn_material(game.board, turn)):
+                self.search_stats['null_move_tries'] += 1
+                null_info = game.make_null_move()
+                score = -self._pvs(game, depth - 1 - self.null_move_reduction, -beta, -beta + 1, ply + 1, False)
+                game.unmake_null_move(null_info)
+                if score >= beta:
+                    self.search_stats['null_move_cutoffs'] += 1
+                    return beta
+            
+            if self.use_futility_pruning and depth < len(self.futility_margins):
+                if static_eval + self.futility_margins[depth] <= alpha:
+                    futility_value = static_eval + self.futility_margins[depth]
+        
+        legal_moves = self._pick_moves(game, legal_moves, depth, ply, tt_move)
+        original_alpha = alpha
+        best_score = float('-inf')
+        best_move = None
+        
+        for index, move in enumerate(legal_moves):
+            from_pos, to_pos, promotion = move
+            is_quiet = not promotion and not self._is_capture(game.board, from_pos, to_pos)
+            move_info = game.make_move(from_pos, to_pos, promotion)
+            gives_check = self._king_in_check(game.board, game.turn)
+            
+            # Futility: a quiet move can't raise a hopeless static score to alpha
+            if futility_value is not None and index > 0 and is_quiet and not gives_check:
+                game.unmake_move(move_info)
+                best_score = max(best_score, futility_value)
+                self.search_stats['futility_pruned'] += 1
+                continue
+            
+            # Late move reductions: quiet moves ordered late are searched shallower first
+            reduction = 0
+            if (self.use_late_move_reductions and depth >= 3 and index >= 3 and is_quiet
+                    and not in_check and not gives_check and not self._is_killer_move(move, ply)):
+                reduction = 1 if index < 6 else 2
+                if self.history_table.get(self._get_move_key(from_pos, to_pos), 0) >= self.lmr_history_threshold:
+                    reduction -= 1
+                reduction = min(reduction, depth - 2)
+            
+            if index == 0:
+                score = -self._pvs(game, depth - 1, -beta, -alpha, ply + 1)
+            else:
+                if reduction > 0:
+                    self.search_stats['lmr_reductions'] += 1
+                    score = -self._pvs(game, depth - 1 - reduction, -alpha - 1, -alpha, ply + 1)
+                    if score > alpha:
+                        self.search_stats['lmr_researches'] += 1
+                        score = -self._pvs(game, depth - 1, -alpha - 1, -alpha, ply + 1)
                 else:
-                    board_str += ' '
-        # Include en_passant_target if exists
-        if board.en_passant_target:
-            board_str += f"e{board.en_passant_target[0]}{board.en_passant_target[1]}"
-        return hash(board_str)
+                    score = -self._pvs(game, depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < score < beta:
+                    score = -self._pvs(game, depth - 1, -beta, -alpha, ply + 1)
+            game.unmake_move(move_info)
+            
+            if score > best_score:
+                best_score = score
+                best_move = move
+                self.pv_table[(board_hash, depth)] = best_move
+            alpha = max(alpha, score)
+            
+            if alpha >= beta:
+                self._count_cutoff(index)
+                if is_quiet:
+                    self._store_killer_move(move, ply)
+                move_key = self._get_move_key(from_pos, to_pos)
+                self.history_table[move_key] = self.history_table.get(move_key, 0) + depth * depth
+                break
         
-    def _quiescence_search(self, game, alpha, beta, is_maximizing, ply_from_root):
-        """Search capture moves until a quiet position is reached"""
+        if best_score <= original_alpha:
+            value_type = UPPER_BOUND
+        elif best_score >= beta:
+            value_type = LOWER_BOUND
+        else:
+            value_type = EXACT
+        self.transposition_table.store(board_hash, depth, best_score, value_type, best_move)
+        return best_score
+
+    def _evaluate_for_side_to_move(self, game):
+        score = self._evaluate_position(game)
+        return score if game.turn == self.color else -score
+
+    def _has_non_pawn_material(self, board, color):
+        return any(not isinstance(piece, (Pawn, King)) for piece in board.piece_lists[color])
+
+    def _pvs_quiescence(self, game, alpha, beta, ply_from_root):
+        """Negamax form of _quiescence_search; scores are from the side to move"""
         self.nodes_evaluated += 1
+        self._check_stop()
         
-        # Static evaluation of the current position
-        stand_pat = self._evaluate_position(game)
+        color = game.turn
+        stand_pat = self._evaluate_for_side_to_move(game)
+        # In check the side to move can't stand pat: every evasion is searched
+        in_check = ply_from_root < self.quiescence_depth and self._king_in_check(game.board, color)
+        if in_check:
+            tactical_moves = self._get_all_legal_moves(game, color)
+            if not tactical_moves:
+                return -100000
+            stand_pat = float('-inf')
+        else:
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+            if ply_from_root >= self.quiescence_depth:
+                return stand_pat
+            tactical_moves = self._get_capture_moves(game, color)
+            if ply_from_root < 2:
+                tactical_moves += self._get_check_moves(game, color)
+            if not tactical_moves:
+                return stand_pat
         
-        # Early return conditions
-        if stand_pat >= beta and is_maximizing:
-            return beta
-        if stand_pat <= alpha and not is_maximizing:
-            return alpha
+        pruned = False
+        for move in self._sort_tactical_moves(game, tactical_moves):
+            from_pos, to_pos, promotion = move
+            
+            # Skip captures that lose material, and even trades that can't lift us back to alpha (delta pruning)
+            if not in_check and not promotion and self._is_capture(game.board, from_pos, to_pos):
+                exchange = self._static_exchange(game.board, from_pos, to_pos)
+                if exchange < 0:
+                    continue
+                if exchange == 0 and stand_pat + 200 < alpha:
+                    pruned = True
+                    continue
+            
+            move_info = game.make_move(from_pos, to_pos, promotion)
+            score = -self._pvs_quiescence(game, -beta, -alpha, ply_from_root + 1)
+            game.unmake_move(move_info)
+            stand_pat = max(stand_pat, score)
+            alpha = max(alpha, stand_pat)
+            if alpha >= beta:
+                return stand_pat
         
-        # Update alpha/beta bounds
-        if is_maximizing and stand_pat > alpha:
-            alpha = stand_pat
-        if not is_maximizing and stand_pat < beta:
-            beta = stand_pat
+        # A pruned capture might have reached alpha, so the score is only known to be at most alpha
+        return max(stand_pat, alpha) if pruned else stand_pat
+
+    def _get_board_hash(self, board):
+        """Zobrist key of the position, maintained incrementally by the board"""
+        return board.zobrist_key
         
-        # Stop quiescence search if we've reached maximum depth
-        if ply_from_root >= self.quiescence_depth:
-            return stand_pat
+    def _quiescence_search(self, game, alpha, beta, is_maximizing, ply_from_root):
+        """Search capture moves until a quiet position is reached"""
+        self.nodes_evaluated += 1
+        self._check_stop()
         
-        # Get and sort capturing moves and check moves
-        color = self.color if (game.turn == self.color) == is_maximizing else self.opponent_color
-        capture_moves = self._get_capture_moves(game, color)
-        check_moves = self._get_check_moves(game, color) if ply_from_root < 2 else []
+        # Static evaluation of the current position
+        stand_pat = self._evaluate_position(game)
+        color = game.turn
         
-        # Combine and sort all tactical moves
-        tactical_moves = capture_moves + check_moves
-        if not tactical_moves:
-            return stand_pat
+        # In check the side to move can't stand pat: every evasion is searched
+        in_check = ply_from_root < self.quiescence_depth and self._king_in_check(game.board, color)
+        if in_check:
+            tactical_moves = self._get_all_legal_moves(game, color)
+            if not tactical_moves:
+                return -100000 if is_maximizing else 100000
+            stand_pat = float('-inf') if is_maximizing else float('inf')
+        else:
+            # Early return conditions
+            if stand_pat >= beta and is_maximizing:
+                return beta
+            if stand_pat <= alpha and not is_maximizing:
+                return alpha
+            
+            # Update alpha/beta bounds
+            if is_maximizing and stand_pat > alpha:
+                alpha = stand_pat
+            if not is_maximizing and stand_pat < beta:
+                beta = stand_pat
+            
+            # Stop quiescence search if we've reached maximum depth
+            if ply_from_root >= self.quiescence_depth:
+                return stand_pat
+            
+            # Get capturing moves, and check moves near the root
+            capture_moves = self._get_capture_moves(game, color)
+            check_moves = self._get_check_moves(game, color) if ply_from_root < 2 else []
+            tactical_moves = capture_moves + check_moves
+            if not tactical_moves:
+                return stand_pat
         
         # Sort captures by MVV-LVA and checks by potential
         tactical_moves = self._sort_tactical_moves(game, tactical_moves)
+        pruned = False
         
         if is_maximizing:
             for move in tactical_moves:
                 from_pos, to_pos, promotion = move
                 
-                # Skip unfavorable exchanges
-                if self._is_capture(game.board, from_pos, to_pos) and not self._is_favorable_capture(game.board, from_pos, to_pos):
-                    # Delta pruning - skip obviously bad captures
-                    moving_piece = game.board.get_piece(from_pos)
-                    target_piece = game.board.get_piece(to_pos)
-                    if target_piece:
-                        moving_value = self.piece_values.get(moving_piece.__class__.__name__, 0)
-                        target_value = self.piece_values.get(target_piece.__class__.__name__, 0)
-                        margin = 200  # Safety margin
-                        if stand_pat + target_value - moving_value + margin < alpha:
-                            continue
+                # Skip losing exchanges, and even trades that can't lift us back to alpha (delta pruning)
+                if not in_check and not promotion and self._is_capture(game.board, from_pos, to_pos):
+                    exchange = self._static_exchange(game.board, from_pos, to_pos)
+                    margin = 200  # Safety margin
+                    if exchange < 0:
+                        continue
+                    if exchange == 0 and stand_pat + margin < alpha:
+                        pruned = True
+                        continue
                 
-                game_copy = self._copy_game(game)
-                game_copy.play_move(from_pos, to_pos, promotion)
-                
-                score = self._quiescence_search(game_copy, alpha, beta, False, ply_from_root + 1)
+                move_info = game.make_move(from_pos, to_pos, promotion)
+                score = self._quiescence_search(game, alpha, beta, False, ply_from_root + 1)
+                game.unmake_move(move_info)
                 stand_pat = max(stand_pat, score)
                 alpha = max(alpha, stand_pat)
                 
                 if alpha >= beta:
-                    break
+                    return stand_pat
+            # A pruned capture might have reached alpha
+            if pruned:
+                stand_pat = max(stand_pat, alpha)
         else:
             for move in tactical_moves:
                 from_pos, to_pos, promotion = move
                 
-                # Skip unfavorable exchanges
-                if self._is_capture(game.board, from_pos, to_pos) and not self._is_favorable_capture(game.board, from_pos, to_pos):
-                    # Delta pruning - skip obviously bad captures
-                    moving_piece = game.board.get_piece(from_pos)
-                    target_piece = game.board.get_piece(to_pos)
-                    if target_piece:
-                        moving_value = self.piece_values.get(moving_piece.__class__.__name__, 0)
-                        target_value = self.piece_values.get(target_piece.__class__.__name__, 0)
-                        margin = 200  # Safety margin
-                        if stand_pat - (target_value - moving_value) - margin > beta:
-                            continue
+                # Skip losing exchanges, and even trades that can't bring us back under beta (delta pruning)
+                if not in_check and not promotion and self._is_capture(game.board, from_pos, to_pos):
+                    exchange = self._static_exchange(game.board, from_pos, to_pos)
+                    margin = 200  # Safety margin
+                    if exchange < 0:
+                        continue
+                    if exchange == 0 and stand_pat - margin > beta:
+                        pruned = True
+                        continue
                 
-                game_copy = self._copy_game(game)
-                game_copy.play_move(from_pos, to_pos, promotion)
-                
-                score = self._quiescence_search(game_copy, alpha, beta, True, ply_from_root + 1)
+                move_info = game.make_move(from_pos, to_pos, promotion)
+                score = self._quiescence_search(game, alpha, beta, True, ply_from_root + 1)
+                game.unmake_move(move_info)
                 stand_pat = min(stand_pat, score)
                 beta = min(beta, stand_pat)
                 
                 if alpha >= beta:
-                    break
+                    return stand_pat
+            # A pruned capture might have got back under beta
+            if pruned:
+                stand_pat = min(stand_pat, beta)
         
         return stand_pat
         
@@ -399,232 +932,103 @@ class ChessAI:
         check_moves = []
         opponent_color = 'black' if color == 'white' else 'white'
         
-        # Find opponent's king position
-        king_pos = None
-        for r in range(8):
-            for c in range(8):
-                piece = game.board.grid[r][c]
-                if piece and isinstance(piece, King) and piece.color == opponent_color:
-                    king_pos = (r, c)
-                    break
-            if king_pos:
-                break
-        
-        if not king_pos:
+        if not game.board.king_positions[opponent_color]:
             return check_moves
         
-        # For each piece of the attacking color, check if it can deliver check
-        for r in range(8):
-            for c in range(8):
-                piece = game.board.grid[r][c]
-                if piece and piece.color == color:
-                    from_pos = (r, c)
-                    moves = piece.legal_moves(game.board)
-                    for to_pos in moves:
-                        # Skip captures as they're already handled
-                        if game.board.get_piece(to_pos):
-                            continue
-                        
-                        # Check if this move gives check
-                        new_board = game.board.copy()
-                        new_board.move_piece(from_pos, to_pos)
-                        if not self._king_in_check(new_board, color) and self._results_in_check(new_board, opponent_color):
-                            if isinstance(piece, Pawn) and ((piece.color == 'white' and to_pos[0] == 0) or (piece.color == 'black' and to_pos[0] == 7)):
-                                for promotion in ['Q', 'R', 'B', 'N']:
-                                    check_moves.append((from_pos, to_pos, promotion))
-                            else:
-                                check_moves.append((from_pos, to_pos, None))
+        # Of the legal non-captures, keep the ones that deliver check
+        for from_pos, to_pos, promotion in game.board.generate_legal_moves(color):
+            # Skip captures as they're already handled
+            if game.board.get_piece(to_pos):
+                continue
+            if self._gives_check(game.board, from_pos, to_pos, promotion, opponent_color):
+                check_moves.append((from_pos, to_pos, promotion))
         
         return check_moves
 
     def _get_capture_moves(self, game, color):
         """Get only capturing moves for quiescence search"""
-        capture_moves = []
-        for r in range(8):
-            for c in range(8):
-                piece = game.board.grid[r][c]
-                if piece and piece.color == color:
-                    from_pos = (r, c)
-                    moves = piece.legal_moves(game.board)
-                    for to_pos in moves:
-                        # Only include captures
-                        target_piece = game.board.get_piece(to_pos)
-                        if target_piece:
-                            if isinstance(piece, Pawn) and ((piece.color == 'white' and to_pos[0] == 0) or 
-                                                          (piece.color == 'black' and to_pos[0] == 7)):
-                                for promotion in ['Q', 'R', 'B', 'N']:
-                                    new_board = game.board.copy()
-                                    new_board.move_piece(from_pos, to_pos, promotion)
-                                    if not self._king_in_check(new_board, color):
-                                        capture_moves.append((from_pos, to_pos, promotion))
-                            else:
-                                new_board = game.board.copy()
-                                new_board.move_piece(from_pos, to_pos)
-                                if not self._king_in_check(new_board, color):
-                                    capture_moves.append((from_pos, to_pos, None))
-        return capture_moves
+        return game.board.generate_legal_moves(color, captures_only=True)
 
     def _get_all_legal_moves(self, game, color):
-        legal_moves = []
-        for r in range(8):
-            for c in range(8):
-                piece = game.board.grid[r][c]
-                if piece and piece.color == color:
-                    from_pos = (r, c)
-                    moves = piece.legal_moves(game.board)
-                    for to_pos in moves:
-                        if isinstance(piece, Pawn) and ((piece.color == 'white' and to_pos[0] == 0) or (piece.color == 'black' and to_pos[0] == 7)):
-                            for promotion in ['Q', 'R', 'B', 'N']:
-                                new_board = game.board.copy()
-                                new_board.move_piece(from_pos, to_pos, promotion)
-                                if not self._king_in_check(new_board, color) and not self._kings_adjacent(new_board):
-                                    legal_moves.append((from_pos, to_pos, promotion))
-                        else:
-                            new_board = game.board.copy()
-                            new_board.move_piece(from_pos, to_pos)
-                            if not self._king_in_check(new_board, color) and not self._kings_adjacent(new_board):
-                                legal_moves.append((from_pos, to_pos, None))
-        return legal_moves
+        return game.board.generate_legal_moves(color)
 
     def _king_in_check(self, board, color):
-        king_pos = None
-        for r in range(8):
-            for c in range(8):
-                piece = board.grid[r][c]
-                if piece and piece.__class__.__name__ == 'King' and piece.color == color:
-                    king_pos = (r, c)
-                    break
-            if king_pos:
-                break
+        king_pos = board.king_positions[color]
         opponent_color = 'black' if color == 'white' else 'white'
         return board.is_under_attack(king_pos, opponent_color) if king_pos else False
 
-    def _kings_adjacent(self, board):
-        """Check if the kings are adjacent to each other."""
-        white_king_pos = None
-        black_king_pos = None
-        for r in range(8):
-            for c in range(8):
-                piece = board.grid[r][c]
-                if piece and piece.__class__.__name__ == 'King':
-                    if piece.color == 'white':
-                        white_king_pos = (r, c)
-                    elif piece.color == 'black':
-                        black_king_pos = (r, c)
-        if white_king_pos and black_king_pos:
-            return abs(white_king_pos[0] - black_king_pos[0]) <= 1 and abs(white_king_pos[1] - black_king_pos[1]) <= 1
-        return False
-
     def _evaluate_position(self, game):
-        if game.in_checkmate(self.color):
-            return -100000
-        elif game.in_checkmate(self.opponent_color):
-            return 100000
-        elif game.in_stalemate(game.turn):
-            return 0
-            
-        # Material score calculation
-        material_score = 0
-        position_score = 0
-        is_endgame = self._is_endgame(game.board)
+        board = game.board
+        key = board.zobrist_key
+        score = self.eval_cache.probe(key)
+        if score is None:
+            score = self._compute_evaluation(game)
+            self.eval_cache.store(key, score)
+        return score
+
+    def _compute_evaluation(self, game):
+        board = game.board
+        if self.eval_profile == 'full':
+            if game.in_checkmate(self.color):
+                return -100000
+            elif game.in_checkmate(self.opponent_color):
+                return 100000
+            elif game.in_stalemate(game.turn):
+                return 0
+        
+        # Material and piece-square totals are kept up to date by the board
+        material_score = board.material[self.color] - board.material[self.opponent_color]
+        
+        # Blend the middlegame and endgame tables by how much material is left
+        phase = min(board.phase, TOTAL_PHASE)
+        middlegame = board.piece_square_mg[self.color] - board.piece_square_mg[self.opponent_color]
+        endgame = board.piece_square_eg[self.color] - board.piece_square_eg[self.opponent_color]
+        position_score = (middlegame * phase + endgame * (TOTAL_PHASE - phase)) / TOTAL_PHASE
+        
+        king_safety = self._evaluate_king_safety(game)
+        pawn_structure = self._evaluate_pawn_structure(game)
+        score = (material_score * 1.0 +
+                 position_score * 0.1 +
+                 king_safety * 0.4 +
+                 pawn_structure * 1.0)
+        if self.eval_profile == 'fast':
+            return score
+        
+        # One pass over each side's attacks gives threats, defenders and mobility
+        attacked = {}
+        mobility = {}
+        attacked[self.color], mobility[self.color] = board.attack_map(self.color)
+        attacked[self.opponent_color], mobility[self.opponent_color] = board.attack_map(self.opponent_color)
         
-        # Count threats and defended pieces
         ai_attacked_value = 0
         opponent_attacked_value = 0
         ai_defended_value = 0
         opponent_defended_value = 0
-        
-        # Map of defended pieces
-        defended_pieces = {}
-        
-        # First pass: identify defended pieces
-        for r in range(8):
-            for c in range(8):
-                piece = game.board.grid[r][c]
-                if not piece:
-                    continue
-                    
-                # Check if piece is defended by a friendly piece
-                if game.board.is_under_attack((r, c), piece.color):
-                    defended_pieces[(r, c)] = True
-        
-        # Second pass: calculate material, position score and threats
-        for r in range(8):
-            for c in range(8):
-                piece = game.board.grid[r][c]
-                if not piece:
-                    continue
-                
-                piece_type = piece.__class__.__name__
-                piece_value = self.piece_values.get(piece_type, 0)
-                
-                # Position score based on piece type and position
-                pos_value = 0
-                if piece_type in self.position_values:
-                    pos_value = self.position_values[piece_type][7-r][c] if piece.color == 'black' else self.position_values[piece_type][r][c]
-                
-                # Special handling for kings in the endgame
-                if piece_type == 'King' and is_endgame:
-                    pos_value = self.king_endgame_values[7-r][c] if piece.color == 'black' else self.king_endgame_values[r][c]
-                
-                # Determine sign for the value based on piece color
-                value_factor = 1 if piece.color == self.color else -1
-                
-                # Add to material score
-                material_score += value_factor * piece_value
-                
-                # Add to position score
-                position_score += value_factor * pos_value
-                
-                # Handle threatened pieces
-                opponent_color = 'white' if piece.color == 'black' else 'black'
-                if game.board.is_under_attack((r, c), opponent_color):
-                    # This piece is under attack
-                    if piece.color == self.color:
-                        # Reduce score more for undefended pieces
-                        if (r, c) not in defended_pieces:
-                            ai_attacked_value += piece_value * 0.5  # Higher penalty for undefended pieces
-                        else:
-                            ai_attacked_value += piece_value * 0.2  # Lower penalty for defended pieces
+        for color in (self.color, self.opponent_color):
+            opponent_color = 'white' if color == 'black' else 'black'
+            for piece in board.piece_lists[color]:
+                piece_value = CLASS_VALUES[piece.__class__]
+                defended = piece.position in attacked[color]
+                if piece.position in attacked[opponent_color]:
+                    # Undefended pieces under attack are penalised more
+                    threat = piece_value * (0.2 if defended else 0.5)
+                    if color == self.color:
+                        ai_attacked_value += threat
                     else:
-                        # Opponent's piece is under attack
-                        if (r, c) not in defended_pieces:
-                            opponent_attacked_value += piece_value * 0.5
-                        else:
-                            opponent_attacked_value += piece_value * 0.2
-                
-                # Handle defended pieces
-                if (r, c) in defended_pieces:
-                    if piece.color == self.color:
-                        ai_defended_value += piece_value * 0.1  # Small bonus for defended pieces
+                        opponent_attacked_value += threat
+                if defended:
+                    if color == self.color:
+                        ai_defended_value += piece_value * 0.1
                     else:
                         opponent_defended_value += piece_value * 0.1
         
-        # Calculate additional strategic factors
-        mobility_score = self._evaluate_mobility(game)
-        king_safety = self._evaluate_king_safety(game)
-        pawn_structure = self._evaluate_pawn_structure(game)
-        
-        # Calculate threat score
+        mobility_score = mobility[self.color] - mobility[self.opponent_color]
         threat_score = opponent_attacked_value - ai_attacked_value
-        
-        # Calculate defense score
         defense_score = ai_defended_value - opponent_defended_value
-        
-        # Weight the different components
-        # Prioritize critical factors like king safety, material and threats
-        return (material_score * 1.0 + 
-                position_score * 0.1 + 
-                mobility_score * 0.3 + 
-                king_safety * 0.4 +  # Increased weight for king safety
-                pawn_structure * 0.1 + 
-                threat_score * 0.4 +  # New component for threats
-                defense_score * 0.1)  # New component for defense
-
-    def _evaluate_mobility(self, game):
-        ai_moves = len(self._get_all_legal_moves(game, self.color))
-        opponent_moves = len(self._get_all_legal_moves(game, self.opponent_color))
-        return ai_moves - opponent_moves
+        return (score +
+                mobility_score * 0.3 +
+                threat_score * 0.4 +
+                defense_score * 0.1)
 
     def _evaluate_king_safety(self, game):
         ai_in_check = game.in_check(self.color)
@@ -632,42 +1036,20 @@ class ChessAI:
         return -30 if ai_in_check else (20 if opponent_in_check else 0)
 
     def _evaluate_pawn_structure(self, game):
-        ai_pawns = opponent_pawns = 0
-        for r in range(8):
-            for c in range(8):
-                piece = game.board.grid[r][c]
-                if piece and piece.__class__.__name__ == 'Pawn':
-                    if piece.color == self.color:
-                        ai_pawns += 1
-                    else:
-                        opponent_pawns += 1
-        return (ai_pawns - opponent_pawns) * 10
+        """Pawn count, doubled, isolated, backward and passed pawns, cached by pawn key"""
+        board = game.board
+        score = self.pawn_cache.probe(board.pawn_key)
+        if score is None:
+            score = evaluate_pawns(board)
+            self.pawn_cache.store(board.pawn_key, score)
+        return score if self.color == 'white' else -score
 
     def _is_endgame(self, board):
-        white_major = black_major = 0
-        for r in range(8):
-            for c in range(8):
-                piece = board.grid[r][c]
-                if piece and piece.__class__.__name__ in ['Queen', 'Rook']:
-                    if piece.color == 'white':
-                        white_major += 1
-                    else:
-                        black_major += 1
-        return white_major <= 1 and black_major <= 1
+        return board.phase <= ENDGAME_PHASE
 
     def _copy_game(self, game):
-        # Create a new game instance with the same settings
-        new_game = type(game)(ai_opponent=False, ai_color=game.ai_color, ai_depth=game.ai.search_depth)
-        
-        # Copy board state manually instead of using deepcopy
-        new_game.board = game.board.copy()
-        new_game.turn = game.turn
-        new_game.move_count = game.move_count
-        
-        # Don't copy history as it's not needed for evaluation
-        new_game.history = []
-        
-        return new_game
+        # Board copy without history; the search then works on it with make/unmake
+        return game.copy()
 
     def _sort_moves(self, game, moves):
         move_scores = []
@@ -688,10 +1070,8 @@ class ChessAI:
                     score += 500
             
             # 2. Score checks (moving to check the opponent's king)
-            new_board = game.board.copy()
-            new_board.move_piece(from_pos, to_pos, promotion)
             opponent = 'black' if moving_piece.color == 'white' else 'white'
-            if self._results_in_check(new_board, opponent):
+            if self._gives_check(game.board, from_pos, to_pos, promotion, opponent):
                 score += 9000
                 
                 # Check if the move also results in discovered check (extremely valuable)
@@ -730,18 +1110,17 @@ class ChessAI:
         
     def _results_in_check(self, board, color):
         """Check if the given color's king is in check on the board"""
-        king_pos = None
-        for r in range(8):
-            for c in range(8):
-                piece = board.grid[r][c]
-                if piece and isinstance(piece, King) and piece.color == color:
-                    king_pos = (r, c)
-                    break
-            if king_pos:
-                break
+        king_pos = board.king_positions[color]
         opponent_color = 'black' if color == 'white' else 'white'
         return board.is_under_attack(king_pos, opponent_color) if king_pos else False
         
+    def _gives_check(self, board, from_pos, to_pos, promotion, opponent):
+        """Check if playing the move leaves the opponent's king in check"""
+        move_info = board.make_move(from_pos, to_pos, promotion)
+        result = self._results_in_check(board, opponent)
+        board.unmake_move(move_info)
+        return result
+        
     def _is_discovered_check(self, board, from_pos, to_pos, moving_color):
         """Check if moving the piece would reveal a discovered check"""
         opponent_color = 'black' if moving_color == 'white' else 'white'
@@ -751,15 +1130,7 @@ class ChessAI:
         board.grid[from_pos[0]][from_pos[1]] = None
         
         # Check if any piece from moving_color can now check opponent's king
-        king_pos = None
-        for r in range(8):
-            for c in range(8):
-                piece = board.grid[r][c]
-                if piece and isinstance(piece, King) and piece.color == opponent_color:
-                    king_pos = (r, c)
-                    break
-            if king_pos:
-                break
+        king_pos = board.king_positions[opponent_color]
                 
         result = board.is_under_attack(king_pos, moving_color) if king_pos else False
         
@@ -768,8 +1139,91 @@ class ChessAI:
         
         return result
 
-    def _sort_moves_with_history(self, game, moves, depth, ply=0):
-        """Sort moves using PV, killer moves, and history heuristic"""
+    def _pick_moves(self, game, moves, depth, ply, tt_move=None):
+        """Yield moves in stages, doing each stage's ordering work only when it is reached.
+
+        Stages: TT/PV move, winning and equal captures (MVV-LVA), killer moves,
+        quiet moves by history (checks first, along with losing captures that
+        give check), then the other losing captures and under-promotions.
+        The board may be changed between yields as long as it is restored
+        before the next move is asked for.
+        """
+        board = game.board
+        tried = []
+        pv_move = self.pv_table.get((self._get_board_hash(board), depth))
+        for move in (tt_move, pv_move):
+            if move and move not in tried and move in moves:
+                tried.append(move)
+                yield move
+        
+        captures = []
+        quiets = []
+        for move in moves:
+            if move in tried:
+                continue
+            if move[2] or board.get_piece(move[1]):
+                captures.append(move)
+            else:
+                quiets.append(move)
+        
+        winning = []
+        losing = []
+        promo_values = {'Q': 900, 'R': 500, 'B': 330, 'N': 320}
+        for move in captures:
+            from_pos, to_pos, promotion = move
+            target_piece = board.get_piece(to_pos)
+            target_value = self.piece_values.get(target_piece.__class__.__name__, 0) if target_piece else 0
+            if promotion:
+                score = target_value + promo_values[promotion]
+                (winning if promotion == 'Q' else losing).append((score - 2000 if promotion != 'Q' else score, move))
+                continue
+            exchange = self._static_exchange(board, from_pos, to_pos)
+            if exchange >= 0:
+                attacker_value = self.piece_values.get(board.get_piece(from_pos).__class__.__name__, 0)
+                winning.append((10 * target_value - attacker_value, move))
+            else:
+                losing.append((exchange, move))
+        winning.sort(reverse=True)
+        for _, move in winning:
+            yield move
+        
+        killers = [move for move in self.killer_moves[ply] if move and move in quiets] if ply < len(self.killer_moves) else []
+        for move in killers:
+            yield move
+        
+        opponent = 'black' if game.turn == 'white' else 'white'
+        scored = [(self._quiet_move_score(game, move, opponent), move) for move in quiets if move not in killers]
+        remaining = []
+        for score, move in losing:
+            from_pos, to_pos, promotion = move
+            if self._gives_check(board, from_pos, to_pos, promotion, opponent):
+                scored.append((7000 + score, move))
+            else:
+                remaining.append((score, move))
+        scored.sort(reverse=True)
+        for _, move in scored:
+            yield move
+        
+        remaining.sort(reverse=True)
+        for _, move in remaining:
+            yield move
+
+    def _quiet_move_score(self, game, move, opponent):
+        """History score plus the check, centralisation and development bonuses of _sort_moves_with_history"""
+        from_pos, to_pos, _ = move
+        score = min(self.history_table.get(self._get_move_key(from_pos, to_pos), 0), 8000)
+        if to_pos in ((3, 3), (3, 4), (4, 3), (4, 4)):
+            score += 100
+        if game.move_count < 10:
+            piece = game.board.get_piece(from_pos)
+            if isinstance(piece, (Knight, Bishop)) and not piece.has_moved:
+                score += 500
+        if self._gives_check(game.board, from_pos, to_pos, None, opponent):
+            score += 7000
+        return score
+
+    def _sort_moves_with_history(self, game, moves, depth, ply=0, tt_move=None):
+        """Sort moves using the TT move, PV, killer moves, and history heuristic"""
         move_scores = []
         board_hash = self._get_board_hash(game.board)
         
@@ -779,7 +1233,10 @@ class ChessAI:
             target_piece = game.board.get_piece(to_pos)
             move_key = self._get_move_key(from_pos, to_pos)
             
-            # 1. Principal Variation - highest priority
+            # 1. Best move stored for this position, then the Principal Variation
+            if tt_move == (from_pos, to_pos, promotion):
+                score += 200000
+            
             # If this move was the best move at this depth in a previous iteration, prioritize it
             if (board_hash, depth) in self.pv_table and self.pv_table[(board_hash, depth)] == (from_pos, to_pos, promotion):
                 score += 100000
@@ -788,11 +1245,12 @@ class ChessAI:
             if target_piece:
                 target_value = self.piece_values.get(target_piece.__class__.__name__, 0)
                 attacker_value = self.piece_values.get(moving_piece.__class__.__name__, 0)
-                score += 10000 + (10 * target_value - attacker_value)
-                
-                # Extra score for good captures (SEE)
-                if self._is_favorable_capture(game.board, from_pos, to_pos):
-                    score += 500
+                exchange = self._static_exchange(game.board, from_pos, to_pos)
+                if exchange >= 0:
+                    score += 10000 + (10 * target_value - attacker_value)
+                else:
+                    # Losing captures go after the quiet moves
+                    score += exchange
             
             # 3. Killer moves
             if self._is_killer_move((from_pos, to_pos, promotion), ply):
@@ -808,10 +1266,8 @@ class ChessAI:
                 score += 8500 + promo_values.get(promotion, 0)
             
             # 6. Checks
-            temp_board = game.board.copy()
-            temp_board.move_piece(from_pos, to_pos, promotion)
             opponent = 'black' if moving_piece.color == 'white' else 'white'
-            if self._results_in_check(temp_board, opponent):
+            if self._gives_check(game.board, from_pos, to_pos, promotion, opponent):
                 score += 7000
             
             # 7. Central control and development (lower priority than tactical moves)
@@ -844,8 +1300,8 @@ class ChessAI:
                 attacker_value = self.piece_values.get(moving_piece.__class__.__name__, 0)
                 score = 10 * target_value - attacker_value
                 
-                # Winning captures (SEE)
-                if self._is_favorable_capture(game.board, from_pos, to_pos):
+                # Captures that don't lose material in the exchange
+                if self._static_exchange(game.board, from_pos, to_pos) >= 0:
                     score += 1000
             
             # 2. Promotions - very high value
@@ -854,10 +1310,8 @@ class ChessAI:
                 score += 5000 + promo_values.get(promotion, 0)
                 
             # 3. Checks in quiescence are valuable too
-            temp_board = game.board.copy()
-            temp_board.move_piece(from_pos, to_pos, promotion)
             opponent = 'black' if moving_piece.color == 'white' else 'white'
-            if self._results_in_check(temp_board, opponent):
+            if self._gives_check(game.board, from_pos, to_pos, promotion, opponent):
                 score += 3000
                 
             move_scores.append((score, (from_pos, to_pos, promotion)))
@@ -865,34 +1319,40 @@ class ChessAI:
         move_scores.sort(reverse=True)
         return [move for _, move in move_scores]
         
-    def _is_favorable_capture(self, board, from_pos, to_pos):
-        """Basic Static Exchange Evaluation (SEE) to check if a capture is favorable"""
-        moving_piece = board.get_piece(from_pos)
+    def _static_exchange(self, board, from_pos, to_pos):
+        """Static exchange evaluation: material won by from_pos capturing on to_pos.
+
+        Both sides keep recapturing with their least valuable attacker, and
+        either side may stop when continuing would lose material. Attackers
+        are looked up again after each capture, so pieces lined up behind an
+        exchanged slider join in. Pins are ignored.
+        """
         target_piece = board.get_piece(to_pos)
-        
         if not target_piece:
-            return False
-            
-        moving_value = self.piece_values.get(moving_piece.__class__.__name__, 0)
-        target_value = self.piece_values.get(target_piece.__class__.__name__, 0)
+            return 0
+        values = self.piece_values
+        gains = [values.get(target_piece.__class__.__name__, 0)]
+        attacker_value = values.get(board.get_piece(from_pos).__class__.__name__, 0)
+        removed = {from_pos}
+        side = target_piece.color
         
-        # Simple evaluation: is the piece being captured more valuable?
-        if target_value > moving_value:
-            return True
-            
-        # Check if the capturing piece would be captured back
-        # Temporarily make the capture
-        temp_board = board.copy()
-        temp_board.move_piece(from_pos, to_pos)
+        while True:
+            attackers = board.attackers_of(to_pos, side, removed)
+            if not attackers:
+                break
+            # The piece now on the square is captured by the cheapest attacker
+            gains.append(attacker_value - gains[-1])
+            if max(-gains[-2], gains[-1]) < 0:
+                break
+            square = min(attackers, key=lambda pos: values.get(board.get_piece(pos).__class__.__name__, 0))
+            attacker_value = values.get(board.get_piece(square).__class__.__name__, 0)
+            removed.add(square)
+            side = 'black' if side == 'white' else 'white'
         
-        # Now check if the target square is under attack
-        opponent_color = 'black' if moving_piece.color == 'white' else 'white'
-        if temp_board.is_under_attack(to_pos, opponent_color):
-            # The capturing piece would be recaptured, so check the exchange value
-            return target_value >= moving_value
-            
-        # No immediate recapture, so it's favorable
-        return True
+        # Unwind the swap list: each side takes the better of capturing and standing pat
+        for i in range(len(gains) - 1, 0, -1):
+            gains[i - 1] = -max(-gains[i - 1], gains[i])
+        return gains[0]
         
     def _get_move_key(self, from_pos, to_pos):
         """Create a unique key for a move to use in the history table"""
@@ -910,4 +1370,174 @@ class ChessAI:
         
     def _is_capture(self, board, from_pos, to_pos):
         """Check if a move is a capture"""
-        return board.get_piece(to_pos) is not None
\ No newline at end of file
+        return board.get_piece(to_pos) is not None
+
+    def _choose_move_bitboard(self, game, start_time):
+        """Iterative deepening negamax over a BitboardPosition built from the game"""
+        self.nodes_evaluated = 0
+        self.killer_moves = [[None, None] for _ in range(self.max_depth + 1)]
+        
+        position = BitboardPosition.from_board(game.board)
+        legal_moves = self._sort_bitboard_moves(position, position.generate_legal_moves(), None)
+        if not legal_moves:
+            return None
+        if len(legal_moves) == 1:
+            return self._bitboard_move_to_move(legal_moves[0])
+        
+        best_move = None
+        best_score = float('-inf')
+        for current_depth in range(1, self.search_depth + 1):
+            self._log(f"Searching at depth {current_depth}...")
+            alpha = float('-inf')
+            beta = float('inf')
+            current_best_move = None
+            current_best_score = float('-inf')
+            
+            try:
+                for move in legal_moves:
+                    position.make_move(move)
+                    score = -self._bitboard_negamax(position, current_depth - 1, -beta, -alpha, 1)
+                    position.unmake_move()
+                    if score > current_best_score:
+                        current_best_score = score
+                        current_best_move = move
+                        self._report_progress(current_depth, self._bitboard_move_to_move(move), score, start_time)
+                    alpha = max(alpha, current_best_score)
+            except SearchAborted:
+                if best_move is None:
+                    best_move = current_best_move or legal_moves[0]
+                self._log(f"Search stopped during depth {current_depth}")
+                break
+            
+            best_move = current_best_move
+            best_score = current_best_score
+            self.previous_eval = best_score
+            self._log(f"Depth {current_depth}: Best move {self._bitboard_move_to_move(best_move)}, Score: {best_score}")
+            self._report_progress(current_depth, self._bitboard_move_to_move(best_move), best_score, start_time,
+                                  completed=True)
+            
+            # Search the best move first in the next iteration
+            legal_moves.remove(best_move)
+            legal_moves.insert(0, best_move)
+            
+            if self._out_of_time(start_time) or abs(best_score) > 90000:
+                break
+        
+        self._print_search_stats(start_time)
+        return self._bitboard_move_to_move(best_move)
+
+    def _bitboard_negamax(self, position, depth, alpha, beta, ply):
+        """Alpha-beta negamax on a BitboardPosition; scores are from the side to move"""
+        self.nodes_evaluated += 1
+        self._check_stop()
+        
+        entry = self.transposition_table.probe(position.key)
+        tt_move = None
+        if entry:
+            stored_depth, stored_value, value_type, tt_move = entry
+            if stored_depth >= depth:
+                if value_type == EXACT:
+                    return stored_value
+                elif value_type == UPPER_BOUND and stored_value <= alpha:
+                    return stored_value
+                elif value_type == LOWER_BOUND and stored_value >= beta:
+                    return stored_value
+        
+        moves = position.generate_legal_moves()
+        if not moves:
+            return -100000 if position.in_check() else 0
+        if depth <= 0:
+            return self._bitboard_quiescence(position, alpha, beta, 0)
+        
+        original_alpha = alpha
+        best_score = float('-inf')
+        best_move = None
+        for move in self._sort_bitboard_moves(position, moves, tt_move, ply):
+            position.make_move(move)
+            score = -self._bitboard_negamax(position, depth - 1, -beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                if position.piece_at(move[1]) is None and ply < len(self.killer_moves):
+                    self._store_killer_move(move, ply)
+                break
+        
+        if best_score <= original_alpha:
+            value_type = UPPER_BOUND
+        elif best_score >= beta:
+            value_type = LOWER_BOUND
+        else:
+            value_type = EXACT
+        self.transposition_table.store(position.key, depth, best_score, value_type, best_move)
+        return best_score
+
+    def _bitboard_quiescence(self, position, alpha, beta, ply_from_root):
+        """Capture-only search on a BitboardPosition"""
+        self.nodes_evaluated += 1
+        self._check_stop()
+        stand_pat = self._evaluate_bitboard(position)
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        if ply_from_root >= self.quiescence_depth:
+            return stand_pat
+        
+        for move in self._sort_bitboard_moves(position, position.generate_legal_moves(captures_only=True), None):
+            position.make_move(move)
+            score = -self._bitboard_quiescence(position, -beta, -alpha, ply_from_root + 1)
+            position.unmake_move()
+            if score > stand_pat:
+                stand_pat = score
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return stand_pat
+
+    def _sort_bitboard_moves(self, position, moves, tt_move, ply=None):
+        """Order bitboard moves: TT move, MVV-LVA captures, promotions, killers"""
+        move_scores = []
+        for move in moves:
+            from_sq, to_sq, promotion = move
+            score = 0
+            if move == tt_move:
+                score += 100000
+            target = position.piece_at(to_sq)
+            if target:
+                attacker = position.piece_at(from_sq)
+                score += 10000 + 10 * self.piece_values[PIECE_NAMES[target[1]]] - self.piece_values[PIECE_NAMES[attacker[1]]]
+            if promotion:
+                promo_values = {'Q': 900, 'R': 500, 'B': 330, 'N': 320}
+                score += 8500 + promo_values.get(promotion, 0)
+            if ply is not None and ply < len(self.killer_moves) and self._is_killer_move(move, ply):
+                score += 9000
+            move_scores.append((score, move))
+        move_scores.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in move_scores]
+
+    def _evaluate_bitboard(self, position):
+        """Material and piece-square evaluation from the side to move's point of view"""
+        pieces = position.pieces
+        white_major = bin(pieces[ROOK] | pieces[QUEEN]).count('1')
+        black_major = bin(pieces[6 + ROOK] | pieces[6 + QUEEN]).count('1')
+        is_endgame = white_major <= 1 and black_major <= 1
+        
+        score = 0
+        for index in range(12):
+            color, piece_type = divmod(index, 6)
+            name = PIECE_NAMES[piece_type]
+            table = self.king_endgame_values if piece_type == KING and is_endgame else self.position_values[name]
+            value = self.piece_values[name]
+            sign = 1 if color == 0 else -1
+            for sq in iter_bits(pieces[index]):
+                r, c = divmod(sq, 8)
+                pos_value = table[7 - r][c] if color == 1 else table[r][c]
+                score += sign * (value + pos_value * 0.1)
+        return score if position.side == 0 else -score
+
+    def _bitboard_move_to_move(self, move):
+        """Convert a (from_sq, to_sq, promotion) move into ChessAI's (row, col) format"""
+        from_sq, to_sq, promotion = move
+        return (to_position(from_sq), to_position(to_sq), promotion)
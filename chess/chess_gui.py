@@ -2,7 +2,9 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk, font
 import os
 import sys
-from chess.pieces import Pawn, King
+import queue
+import threading
+from chess.pieces import Pawn
 from chess.game import Game
 
 class ChessGUI:
@@ -64,10 +66,17 @@ class ChessGUI:
         
         self.ai_color = 'black'
         self.ai_depth = 3
-        self.game = Game(ai_opponent=True, ai_color=self.ai_color, ai_depth=self.ai_depth)
+        self.game = Game(ai_opponent=True, ai_color=self.ai_color, ai_depth=self.ai_depth, ai_autoplay=False)
         self.selected_square = None
         self.last_move = None
         
+        # The AI searches on a worker thread and posts progress/results to this queue,
+        # which the Tk main loop drains; search_id lets us ignore abandoned searches
+        self.ai_queue = queue.Queue()
+        self.ai_thread = None
+        self.ai_thinking = False
+        self.search_id = 0
+        
         # Create custom styles for ttk widgets
         self.style = ttk.Style()
         self.style.theme_use('clam')
@@ -170,6 +179,9 @@ class ChessGUI:
                                font=("Arial", 12), style='TLabel')
         self.ai_label.pack(anchor="w", pady=5)
         
+        self.thinking_label = ttk.Label(status_frame, text="", font=("Arial", 10), style='TLabel')
+        self.thinking_label.pack(anchor="w", pady=5)
+        
         # Action buttons with improved styling
         buttons_frame = ttk.Frame(info_frame, style='TFrame')
         buttons_frame.pack(fill="x", pady=(0, 15))
@@ -186,6 +198,11 @@ class ChessGUI:
         settings_btn = ttk.Button(buttons_frame, text="AI Settings", command=self.ai_settings)
         settings_btn.pack(fill="x", pady=2)
         
+        # Makes the AI play the best move it has found so far
+        self.stop_btn = ttk.Button(buttons_frame, text="Stop Thinking", command=self.stop_ai_search)
+        self.stop_btn.pack(fill="x", pady=2)
+        self.stop_btn.state(['disabled'])
+        
         quit_btn = ttk.Button(buttons_frame, text="Quit Game", command=self.root.quit)
         quit_btn.pack(fill="x", pady=2)
         
@@ -218,6 +235,10 @@ class ChessGUI:
         
         # Set up the turn indicators
         self._update_turn_indicators()
+        
+        # Start draining AI messages and let the AI open if it plays white
+        self.root.after(50, self._poll_ai_queue)
+        self.start_ai_move()
 
     def _update_turn_indicators(self):
         """Update the turn indicators based on the current turn."""
@@ -318,12 +339,8 @@ class ChessGUI:
             self.status_label.config(text=f"{self.game.turn.capitalize()} is in check!")
             
             # Highlight the king in check
-            for r in range(8):
-                for c in range(8):
-                    piece = self.game.board.grid[r][c]
-                    if piece and isinstance(piece, King) and piece.color == self.game.turn:
-                        self.squares[r][c].config(bg=self.colors["check"])
-                        break
+            r, c = self.game.board.king_positions[self.game.turn]
+            self.squares[r][c].config(bg=self.colors["check"])
         else:
             self.status_label.config(text="")
 
@@ -346,14 +363,8 @@ class ChessGUI:
                 self.squares[row][col].config(bg=self.colors["selected"])
                 
                 # Show valid moves
-                legal_moves = piece.legal_moves(self.game.board)
-                for move in legal_moves:
-                    r, c = move
-                    new_board = self.game.board.copy()
-                    new_board.move_piece(pos, move)
-                    
-                    # Check if the move would not leave the king in check
-                    if not Game._king_in_check_after_move(new_board, self.game.turn):
+                for from_pos, (r, c), _ in self.game.board.generate_legal_moves(self.game.turn):
+                    if from_pos == pos:
                         self.squares[r][c].config(bg=self.colors["valid_move"])
         
         # Second click - move the selected piece
@@ -373,12 +384,8 @@ class ChessGUI:
                 self.squares[row][col].config(bg=self.colors["selected"])
                 
                 # Show valid moves for newly selected piece
-                legal_moves = piece.legal_moves(self.game.board)
-                for move in legal_moves:
-                    r, c = move
-                    new_board = self.game.board.copy()
-                    new_board.move_piece(pos, move)
-                    if not Game._king_in_check_after_move(new_board, self.game.turn):
+                for from_pos, (r, c), _ in self.game.board.generate_legal_moves(self.game.turn):
+                    if from_pos == pos:
                         self.squares[r][c].config(bg=self.colors["valid_move"])
                 return
             
@@ -397,31 +404,38 @@ class ChessGUI:
                 promotion_piece = self._show_promotion_dialog()
             
             # Try to make the move
-            if self.try_move(from_pos, to_pos, promotion_piece):
-                # Store the last move for highlighting
-                self.last_move = (from_pos, to_pos)
-                
-                # Add to move history
-                from_alg = self.pos_to_algebraic(from_pos)
-                to_alg = self.pos_to_algebraic(to_pos)
-                
-                # Format move text with appropriate styling
-                move_num = len(self.game.history) // 2 + (1 if self.game.turn == 'black' else 0)
-                move_text = f"{move_num}. {from_alg} → {to_alg}"
-                if promotion_piece:
-                    # Show the promotion piece symbol
-                    symbol = {'Q': '♛', 'R': '♜', 'B': '♝', 'N': '♞'}.get(promotion_piece, '♛')
-                    move_text += f" = {symbol}"
-                    
-                self.history_list.insert(tk.END, move_text)
-                self.history_list.see(tk.END)
-                
-                # Alternate colors in the move history list for better readability
-                if self.history_list.size() % 2 == 0:
-                    self.history_list.itemconfigure(tk.END, background=self.colors["dark_square"])
+            moved = self.try_move(from_pos, to_pos, promotion_piece)
             
             # Update the board display
             self.update_board()
+            
+            # Let the AI reply once the player's move is on screen
+            if moved:
+                self.root.after(100, self.start_ai_move)
+    
+    def _record_move(self, from_pos, to_pos, promotion_piece):
+        """Highlight a move that was just played and add it to the move history."""
+        # Store the last move for highlighting
+        self.last_move = (from_pos, to_pos)
+        
+        # Add to move history
+        from_alg = self.pos_to_algebraic(from_pos)
+        to_alg = self.pos_to_algebraic(to_pos)
+        
+        # Format move text with appropriate styling
+        move_num = len(self.game.history) // 2 + (1 if self.game.turn == 'black' else 0)
+        move_text = f"{move_num}. {from_alg} → {to_alg}"
+        if promotion_piece:
+            # Show the promotion piece symbol
+            symbol = {'Q': '♛', 'R': '♜', 'B': '♝', 'N': '♞'}.get(promotion_piece, '♛')
+            move_text += f" = {symbol}"
+            
+        self.history_list.insert(tk.END, move_text)
+        self.history_list.see(tk.END)
+        
+        # Alternate colors in the move history list for better readability
+        if self.history_list.size() % 2 == 0:
+            self.history_list.itemconfigure(tk.END, background=self.colors["dark_square"])
     
     def _show_promotion_dialog(self):
         """Display a custom promotion dialog with piece symbols."""
@@ -478,19 +492,91 @@ class ChessGUI:
     def try_move(self, from_pos, to_pos, promotion_piece=None):
         """Attempt to make a move on the board."""
         if self.game.play_move(from_pos, to_pos, promotion_piece):
-            # Flash the moved piece for visual feedback
-            self.root.update()
-            
-            # If it's now the AI's turn, update after a short delay
-            if self.game.turn == self.game.ai_color:
-                self.root.after(500, self.update_board)
-            
+            self._record_move(from_pos, to_pos, promotion_piece)
             return True
         return False
 
+    def start_ai_move(self):
+        """Start the AI search on a worker thread if it is the AI's turn."""
+        if self.ai_thinking or not self.game.ai_opponent or self.game.turn != self.game.ai_color:
+            return
+        if self.game.in_checkmate(self.game.turn) or self.game.in_stalemate(self.game.turn):
+            return
+        
+        # The worker searches a snapshot, so the GUI can keep reading self.game
+        snapshot = self.game.copy()
+        ai = self.game.ai
+        self.search_id += 1
+        search_id = self.search_id
+        ai.progress_callback = lambda info: self.ai_queue.put(('progress', search_id, info))
+        # Made before the thread starts so Stop pressed straight away is not lost
+        stop_event = ai.new_stop_event()
+        
+        self.ai_thinking = True
+        self.stop_btn.state(['!disabled'])
+        self.thinking_label.config(text="Thinking...")
+        self.ai_thread = threading.Thread(target=self._run_ai_search, args=(ai, snapshot, search_id, stop_event),
+                                          daemon=True)
+        self.ai_thread.start()
+
+    def _run_ai_search(self, ai, snapshot, search_id, stop_event):
+        """Worker thread body: search and post the chosen move back to the GUI."""
+        move = None
+        try:
+            move = ai.choose_move(snapshot, stop_event=stop_event)
+        finally:
+            self.ai_queue.put(('done', search_id, move))
+
+    def _poll_ai_queue(self):
+        """Apply AI progress and results on the Tk main loop."""
+        try:
+            while True:
+                kind, search_id, payload = self.ai_queue.get_nowait()
+                if search_id != self.search_id:
+                    continue
+                if kind == 'progress' and self.ai_thinking:
+                    best = payload['best_move']
+                    best_text = f"{self.pos_to_algebraic(best[0])}-{self.pos_to_algebraic(best[1])}" if best else "-"
+                    self.thinking_label.config(
+                        text=f"Thinking... depth {payload['depth']}, {payload['nodes']} nodes, best {best_text}")
+                elif kind == 'done':
+                    self._finish_ai_move(payload)
+        except queue.Empty:
+            pass
+        self.root.after(50, self._poll_ai_queue)
+
+    def _finish_ai_move(self, move):
+        self.ai_thinking = False
+        self.stop_btn.state(['disabled'])
+        self.thinking_label.config(text="")
+        if move:
+            from_pos, to_pos, promotion = move
+            if self.game.play_move(from_pos, to_pos, promotion):
+                self._record_move(from_pos, to_pos, promotion)
+        self.update_board()
+
+    def stop_ai_search(self):
+        """Stop the running search; the AI plays the best move found so far."""
+        if self.ai_thinking:
+            self.game.ai.stop()
+            self.thinking_label.config(text="Stopping...")
+
+    def _cancel_ai_search(self):
+        """Abandon the running search without playing its move."""
+        if not self.ai_thinking:
+            return
+        self.search_id += 1
+        self.game.ai.stop()
+        if self.ai_thread:
+            self.ai_thread.join(timeout=2)
+        self.ai_thinking = False
+        self.stop_btn.state(['disabled'])
+        self.thinking_label.config(text="")
+
     def save_ai_settings(self, color, depth, dialog):
         """Save the new AI settings and optionally start a new game."""
         if color != self.ai_color or depth != self.ai_depth:
+            self._cancel_ai_search()
             # Store the new settings
             self.ai_color = color
             self.ai_depth = depth
@@ -506,9 +592,9 @@ class ChessGUI:
                 # Update existing game
                 self.game.ai_color = self.ai_color
                 self.game.ai.search_depth = self.ai_depth
-                self.game.ai.color = self.ai_color
-                self.game.ai.opponent_color = 'white' if self.ai_color == 'black' else 'black'
+                self.game.ai.set_color(self.ai_color)
                 self.update_board()
+                self.start_ai_move()
         else:
             dialog.destroy()
 
@@ -610,7 +696,8 @@ class ChessGUI:
         if messagebox.askyesno("New Game", "Start a new game?", 
                            icon=messagebox.QUESTION):
             # Reset the game
-            self.game = Game(ai_opponent=True, ai_color=self.ai_color, ai_depth=self.ai_depth)
+            self._cancel_ai_search()
+            self.game = Game(ai_opponent=True, ai_color=self.ai_color, ai_depth=self.ai_depth, ai_autoplay=False)
             self.last_move = None
             
             # Clear history
@@ -621,11 +708,20 @@ class ChessGUI:
             
             # If AI plays white, make its move
             if self.ai_color == 'white':
-                self.root.after(500, self.game.make_ai_move)
-                self.root.after(600, self.update_board)
+                self.root.after(500, self.start_ai_move)
 
     def undo_move(self):
         """Undo the last player and AI moves."""
+        # If the AI is still thinking, only the player's move needs taking back
+        if self.ai_thinking:
+            self._cancel_ai_search()
+            if self.game.undo_move():
+                self.last_move = (self.game.history[-1][0], self.game.history[-1][1]) if self.game.history else None
+                if self.history_list.size() > 0:
+                    self.history_list.delete(self.history_list.size()-1)
+            self.update_board()
+            return
+        
         # Need at least 2 moves to undo (player + AI)
         if self.game.ai_opponent and len(self.game.history) >= 2:
             # Undo AI's move
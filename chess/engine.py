@@ -0,0 +1,59 @@
+"""The headless engine: board, pieces, game and search, without the GUI.
+
+Worker processes, the UCI front end and scripts should import from here.
+Nothing this module imports pulls in tkinter, which only chess.chess_gui
+needs.
+
+Run with: python -m chess.engine
+to time a cold import and the start of a one-worker pool (shared-memory
+transposition table, pool spawn and _init_worker) against STARTUP_BUDGET_SECONDS.
+"""
+from chess.pieces import Piece, Pawn, Rook, Knight, Bishop, Queen, King
+from chess.board import Board, STARTING_FEN
+from chess.game import Game
+from chess.chess_ai import ChessAI, SearchAborted
+from chess.transposition import create_transposition_table, EvaluationCache
+from chess.epd import read_epd, parse_epd
+
+# Seconds a fresh interpreter may take to import the engine and start a search worker.
+# About half of it is importing multiprocessing and concurrent.futures for the pool.
+STARTUP_BUDGET_SECONDS = 0.25
+
+# Run in a fresh interpreter so nothing is already imported. The first task's
+# result only comes back once the worker has run _init_worker.
+_STARTUP_PROBE = '''
+import sys, time
+start = time.perf_counter()
+import chess.engine
+imported = time.perf_counter()
+ai = chess.engine.ChessAI('white', 3)
+spawn = time.perf_counter()
+from chess.parallel import RootSplitSearch, _worker_imports_tkinter
+search = RootSplitSearch(ai, 1)
+worker_tkinter = search.pool.submit(_worker_imports_tkinter).result()
+ready = time.perf_counter()
+search.shutdown()
+print(imported - start, ready - spawn, 'tkinter' in sys.modules or worker_tkinter)
+'''
+
+
+def measure_startup():
+    """Time a cold import of chess.engine and a search worker's start-up in a new interpreter.
+
+    Returns (import_seconds, setup_seconds, tkinter_imported).
+    """
+    import subprocess
+    import sys
+    output = subprocess.run([sys.executable, '-c', _STARTUP_PROBE], capture_output=True, text=True,
+                            check=True).stdout.split()
+    return float(output[0]), float(output[1]), output[2] == 'True'
+
+
+if __name__ == '__main__':
+    import_seconds, setup_seconds, tkinter_imported = measure_startup()
+    total = import_seconds + setup_seconds
+    print(f"import {import_seconds * 1000:.1f} ms, worker start-up {setup_seconds * 1000:.1f} ms, "
+          f"total {total * 1000:.1f} ms (budget {STARTUP_BUDGET_SECONDS * 1000:.0f} ms)")
+    if tkinter_imported:
+        print("tkinter was imported")
+    raise SystemExit(0 if total <= STARTUP_BUDGET_SECONDS and not tkinter_imported else 1)
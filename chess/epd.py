@@ -0,0 +1,46 @@
+"""Read EPD test suites one position at a time.
+
+An EPD line is the first four FEN fields followed by operations such as
+    r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - bm Bb5; id "ruy";
+"""
+import shlex
+from chess.board import Board
+
+
+def parse_epd(line):
+    """Split an EPD line into (fen, operations).
+
+    operations maps each opcode to its operands as a list of strings. The
+    FEN gets its move counters from the hmvc and fmvn operations, or 0 and 1.
+    """
+    fields = line.split(maxsplit=4)
+    if len(fields) < 4:
+        raise ValueError(f"Invalid EPD line '{line}'")
+    operations = {}
+    if len(fields) > 4:
+        for operation in fields[4].split(';'):
+            tokens = shlex.split(operation)
+            if tokens:
+                operations[tokens[0]] = tokens[1:]
+    halfmove = operations.get('hmvc', ['0'])[0]
+    fullmove = operations.get('fmvn', ['1'])[0]
+    return ' '.join(fields[:4] + [halfmove, fullmove]), operations
+
+
+def read_epd(source):
+    """Yield (board, operations) for every position in an EPD file or iterable of lines.
+
+    Lines are parsed as they are read, so suites of any size can be streamed
+    into a search without loading them all first. Blank lines and lines
+    starting with '#' are skipped.
+    """
+    if isinstance(source, str):
+        with open(source) as f:
+            yield from read_epd(f)
+        return
+    for line in source:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        fen, operations = parse_epd(line)
+        yield Board.from_fen(fen), operations
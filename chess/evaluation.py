@@ -0,0 +1,108 @@
+# Static evaluation tables shared by Board (which keeps running totals of them) and ChessAI.
+# Piece-square tables are written [row][col] from white's side of the board; black reads
+# them mirrored, at [7 - row][col]. PIECE_SCORES holds them flattened and pre-mirrored.
+from chess.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+PIECE_VALUES = {'Pawn': 100, 'Knight': 300, 'Bishop': 320, 'Rook': 500, 'Queen': 1500, 'King': 10000}
+
+POSITION_VALUES = {
+    'Pawn': [[0,0,0,0,0,0,0,0],[50,50,50,50,50,50,50,50],[10,10,20,30,30,20,10,10],[5,5,10,25,25,10,5,5],[0,0,0,20,20,0,0,0],[5,-5,-10,0,0,-10,-5,5],[5,10,10,-20,-20,10,10,5],[0,0,0,0,0,0,0,0]],
+    'Knight': [[-50,-40,-30,-30,-30,-30,-40,-50],[-40,-20,0,0,0,0,-20,-40],[-30,0,10,15,15,10,0,-30],[-30,5,15,20,20,15,5,-30],[-30,0,15,20,20,15,0,-30],[-30,5,10,15,15,10,5,-30],[-40,-20,0,5,5,0,-20,-40],[-50,-40,-30,-30,-30,-30,-40,-50]],
+    'Bishop': [[-20,-10,-10,-10,-10,-10,-10,-20],[-10,0,0,0,0,0,0,-10],[-10,0,10,10,10,10,0,-10],[-10,5,5,10,10,5,5,-10],[-10,0,5,10,10,5,0,-10],[-10,5,5,5,5,5,5,-10],[-10,0,5,0,0,5,0,-10],[-20,-10,-10,-10,-10,-10,-10,-20]],
+    'Rook': [[0,0,0,0,0,0,0,0],[5,10,10,10,10,10,10,5],[-5,0,0,0,0,0,0,-5],[-5,0,0,0,0,0,0,-5],[-5,0,0,0,0,0,0,-5],[-5,0,0,0,0,0,0,-5],[-5,0,0,0,0,0,0,-5],[0,0,0,5,5,0,0,0]],
+    'Queen': [[-20,-10,-10,-5,-5,-10,-10,-20],[-10,0,0,0,0,0,0,-10],[-10,0,5,5,5,5,0,-10],[-5,0,5,5,5,5,0,-5],[0,0,5,5,5,5,0,-5],[-10,5,5,5,5,5,0,-10],[-10,0,5,0,0,0,0,-10],[-20,-10,-10,-5,-5,-10,-10,-20]],
+    'King': [[-30,-40,-40,-50,-50,-40,-40,-30],[-30,-40,-40,-50,-50,-40,-40,-30],[-30,-40,-40,-50,-50,-40,-40,-30],[-30,-40,-40,-50,-50,-40,-40,-30],[-20,-30,-30,-40,-40,-30,-30,-20],[-10,-20,-20,-20,-20,-20,-20,-10],[20,20,0,0,0,0,20,20],[20,30,10,0,0,10,30,20]]
+}
+
+KING_ENDGAME_VALUES = [[-50,-40,-30,-20,-20,-30,-40,-50],[-30,-20,-10,0,0,-10,-20,-30],[-30,-10,20,30,30,20,-10,-30],[-30,-10,30,40,40,30,-10,-30],[-30,-10,30,40,40,30,-10,-30],[-30,-10,20,30,30,20,-10,-30],[-30,-30,0,0,0,0,-30,-30],[-50,-30,-30,-30,-30,-30,-30,-50]]
+
+# Endgame tables: pawns gain value as they advance and the king heads for the centre;
+# the other pieces keep their middlegame tables
+ENDGAME_POSITION_VALUES = {
+    'Pawn': [[0,0,0,0,0,0,0,0],[80,80,80,80,80,80,80,80],[50,50,50,50,50,50,50,50],[30,30,30,30,30,30,30,30],[15,15,15,15,15,15,15,15],[5,5,5,5,5,5,5,5],[0,0,0,0,0,0,0,0],[0,0,0,0,0,0,0,0]],
+    'Knight': POSITION_VALUES['Knight'],
+    'Bishop': POSITION_VALUES['Bishop'],
+    'Rook': POSITION_VALUES['Rook'],
+    'Queen': POSITION_VALUES['Queen'],
+    'King': KING_ENDGAME_VALUES
+}
+
+# Game phase: each minor piece counts 1, rook 2, queen 4; 24 with all pieces on the board.
+# The evaluation blends the middlegame and endgame tables in proportion to it.
+PHASE_WEIGHTS = {'Pawn': 0, 'Knight': 1, 'Bishop': 1, 'Rook': 2, 'Queen': 4, 'King': 0}
+TOTAL_PHASE = 24
+
+# At or below this phase (e.g. a rook and two minor pieces each) the position counts as an endgame
+ENDGAME_PHASE = 8
+
+PIECE_CLASSES = {'Pawn': Pawn, 'Knight': Knight, 'Bishop': Bishop, 'Rook': Rook, 'Queen': Queen, 'King': King}
+CLASS_VALUES = {cls: PIECE_VALUES[name] for name, cls in PIECE_CLASSES.items()}
+
+
+def _flat_table(table, color):
+    """64-entry list indexed by row * 8 + col, mirrored for black."""
+    rows = table[::-1] if color == 'black' else table
+    return [value for row in rows for value in row]
+
+
+# PIECE_SCORES[color][piece class] = (material, phase weight, middlegame table, endgame table).
+# Kings carry no material here: both sides always have one.
+PIECE_SCORES = {
+    color: {
+        cls: (0 if name == 'King' else PIECE_VALUES[name], PHASE_WEIGHTS[name],
+              _flat_table(POSITION_VALUES[name], color), _flat_table(ENDGAME_POSITION_VALUES[name], color))
+        for name, cls in PIECE_CLASSES.items()
+    }
+    for color in ('white', 'black')
+}
+
+
+# Pawn-structure terms, per pawn
+DOUBLED_PAWN_PENALTY = 15
+ISOLATED_PAWN_PENALTY = 12
+BACKWARD_PAWN_PENALTY = 8
+# Bonus for a passed pawn by how many ranks it has advanced from its starting square
+PASSED_PAWN_BONUS = [0, 10, 20, 35, 60, 100]
+
+
+def evaluate_pawns(board):
+    """Score the pawn structure from white's point of view.
+
+    Depends only on where the pawns are, so callers can cache it by
+    Board.pawn_key.
+    """
+    # Rows of each side's pawns, per file
+    rows = {'white': [[] for _ in range(8)], 'black': [[] for _ in range(8)]}
+    for color in ('white', 'black'):
+        for piece in board.piece_lists[color]:
+            if isinstance(piece, Pawn):
+                r, c = piece.position
+                rows[color][c].append(r)
+    
+    score = 0
+    for color, sign in (('white', 1), ('black', -1)):
+        own = rows[color]
+        enemy = rows['black' if color == 'white' else 'white']
+        forward = -1 if color == 'white' else 1
+        for c in range(8):
+            if not own[c]:
+                continue
+            score += sign * len(own[c])
+            score -= sign * DOUBLED_PAWN_PENALTY * (len(own[c]) - 1)
+            neighbours = [f for f in (c - 1, c + 1) if 0 <= f < 8]
+            isolated = not any(own[f] for f in neighbours)
+            for r in own[c]:
+                if isolated:
+                    score -= sign * ISOLATED_PAWN_PENALTY
+                # Passed: no enemy pawn ahead on this or an adjacent file
+                if not any((er - r) * forward > 0 for f in neighbours + [c] for er in enemy[f]):
+                    advanced = 6 - r if color == 'white' else r - 1
+                    score += sign * PASSED_PAWN_BONUS[min(max(advanced, 0), 5)]
+                elif not isolated:
+                    # Backward: every neighbour is further advanced and an enemy pawn guards the stop square
+                    supported = any((fr - r) * forward <= 0 for f in neighbours for fr in own[f])
+                    stop_row = r + forward
+                    guarded = any(er == stop_row + forward for f in neighbours for er in enemy[f])
+                    if not supported and guarded:
+                        score -= sign * BACKWARD_PAWN_PENALTY
+    return score
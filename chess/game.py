@@ -3,32 +3,99 @@ from chess.board import Board
 from chess.chess_ai import ChessAI
 
 class Game:
-    def __init__(self, ai_opponent=True, ai_color='black', ai_depth=3):
+    def __init__(self, ai_opponent=True, ai_color='black', ai_depth=3, ai_autoplay=True):
         self.board = Board()
         self.turn = 'white'
         self.history = []
         self.move_count = 0
         self.ai_opponent = ai_opponent
         self.ai_color = ai_color
-        self.ai = ChessAI(ai_color, ai_depth)
-        if self.ai_color == 'white' and ai_opponent:
+        # When False the caller decides when to run the AI (e.g. the GUI on a worker thread)
+        self.ai_autoplay = ai_autoplay
+        self.ai_depth = ai_depth
+        self._ai = None
+        if self.ai_color == 'white' and ai_opponent and ai_autoplay:
             self.make_ai_move()
 
+    @property
+    def ai(self):
+        """The game's ChessAI, created on first use.
+
+        Games built only to be searched (search copies, worker processes)
+        never need one, and its transposition table is costly to allocate.
+        """
+        if self._ai is None:
+            self._ai = ChessAI(self.ai_color, self.ai_depth)
+        return self._ai
+
     def switch_turn(self):
         self.turn = 'black' if self.turn == 'white' else 'white'
         if self.turn == 'white':
             self.move_count += 1
 
+    def make_move(self, from_pos, to_pos, promotion_piece=None):
+        """Play a move in place without legality checks, history or AI replies.
+
+        Returns the board's move record, which `unmake_move` uses to restore
+        the position. This is what the search uses to walk the game tree.
+        """
+        move_info = self.board.make_move(from_pos, to_pos, promotion_piece)
+        self.switch_turn()
+        return move_info
+
+    def unmake_move(self, move_info):
+        """Take back a move played with `make_move`."""
+        self.board.unmake_move(move_info)
+        if self.turn == 'white':
+            self.move_count -= 1
+        self.turn = 'black' if self.turn == 'white' else 'white'
+
+    def make_null_move(self):
+        """Hand the move to the other side without playing one (for null-move pruning)."""
+        move_info = self.board.make_null_move()
+        self.turn = 'black' if self.turn == 'white' else 'white'
+        return move_info
+
+    def unmake_null_move(self, move_info):
+        self.board.unmake_null_move(move_info)
+        self.turn = 'black' if self.turn == 'white' else 'white'
+
+    def copy(self):
+        """Copy the position, turn and move count (not the history) into a new game.
+
+        The copy shares no pieces with this game, so it can be searched on another
+        thread while this one keeps changing.
+        """
+        ai_depth = self._ai.search_depth if self._ai is not None else self.ai_depth
+        new_game = Game(ai_opponent=False, ai_color=self.ai_color, ai_depth=ai_depth)
+        new_game.board = self.board.copy()
+        new_game.turn = self.turn
+        new_game.move_count = self.move_count
+        return new_game
+
+    def load_fen(self, fen):
+        """Replace the position with the one in a FEN string; the history is cleared."""
+        self.board = Board.from_fen(fen)
+        self.turn = self.board.side_to_move
+        fields = fen.split()
+        self.move_count = int(fields[5]) - 1 if len(fields) > 5 else 0
+        self.history = []
+
+    def to_fen(self):
+        return self.board.to_fen(self.move_count + 1)
+
+    def save(self, path):
+        """Write the current position to a file as a FEN line."""
+        with open(path, 'w') as f:
+            f.write(self.to_fen() + '\n')
+
+    def load(self, path):
+        """Load a position written by `save` (or any file whose first line is a FEN)."""
+        with open(path) as f:
+            self.load_fen(f.readline().strip())
+
     def in_check(self, color):
-        king_pos = None
-        for r in range(8):
-            for c in range(8):
-                piece = self.board.grid[r][c]
-                if piece and isinstance(piece, King) and piece.color == color:
-                    king_pos = (r, c)
-                    break
-            if king_pos:
-                break
+        king_pos = self.board.king_positions[color]
         opponent_color = 'black' if color == 'white' else 'white'
         return self.board.is_under_attack(king_pos, opponent_color) if king_pos else False
 
@@ -39,29 +106,11 @@ class Game:
         return not self.in_check(color) and not self._has_legal_moves(color)
 
     def _has_legal_moves(self, color):
-        for r in range(8):
-            for c in range(8):
-                piece = self.board.grid[r][c]
-                if piece and piece.color == color:
-                    from_pos = (r, c)
-                    for to_pos in piece.legal_moves(self.board):
-                        new_board = self.board.copy()
-                        new_board.move_piece(from_pos, to_pos)
-                        if not self._king_in_check_after_move(new_board, color):
-                            return True
-        return False
+        return bool(self.board.generate_legal_moves(color))
 
     @staticmethod
     def _king_in_check_after_move(board, color):
-        king_pos = None
-        for r in range(8):
-            for c in range(8):
-                piece = board.grid[r][c]
-                if piece and isinstance(piece, King) and piece.color == color:
-                    king_pos = (r, c)
-                    break
-            if king_pos:
-                break
+        king_pos = board.king_positions[color]
         opponent_color = 'black' if color == 'white' else 'white'
         return board.is_under_attack(king_pos, opponent_color) if king_pos else False
 
@@ -69,40 +118,7 @@ class Game:
         if not self.history:
             return False
         move_info = self.history.pop()
-        from_pos, to_pos, captured_piece, special_move, promotion = move_info
-        piece = self.board.get_piece(to_pos)
-        self.board.grid[from_pos[0]][from_pos[1]] = piece
-        if piece:
-            piece.position = from_pos
-            piece.has_moved = False if special_move in ["castling", "promotion"] else piece.has_moved
-        self.board.grid[to_pos[0]][to_pos[1]] = captured_piece
-        if special_move == "castling":
-            if to_pos[1] > from_pos[1]:
-                rook_pos = (from_pos[0], to_pos[1] - 1)
-                rook = self.board.get_piece(rook_pos)
-                if rook:
-                    self.board.grid[rook_pos[0]][rook_pos[1]] = None
-                    self.board.grid[from_pos[0]][7] = rook
-                    rook.position = (from_pos[0], 7)
-                    rook.has_moved = False
-            else:
-                rook_pos = (from_pos[0], to_pos[1] + 1)
-                rook = self.board.get_piece(rook_pos)
-                if rook:
-                    self.board.grid[rook_pos[0]][rook_pos[1]] = None
-                    self.board.grid[from_pos[0]][0] = rook
-                    rook.position = (from_pos[0], 0)
-                    rook.has_moved = False
-        elif special_move == "en_passant":
-            captured_pos = (from_pos[0], to_pos[1])
-            self.board.grid[captured_pos[0]][captured_pos[1]] = captured_piece
-        elif special_move == "promotion" and promotion:
-            self.board.grid[from_pos[0]][from_pos[1]] = Pawn(piece.color, from_pos)
-        
-        # Reset en_passant_target (we don't track the previous value in the tuple)
-        self.board.en_passant_target = None
-        
-        self.switch_turn()
+        self.unmake_move(move_info[5])
         return True
 
     def detect_tactics(self):
@@ -116,9 +132,10 @@ class Game:
                 if legal_moves:
                     all_moves_illegal = True
                     for move in legal_moves:
-                        new_board = self.board.copy()
-                        new_board.move_piece((r, c), move)
-                        if not self._king_in_check_after_move(new_board, piece.color):
+                        move_info = self.board.make_move((r, c), move)
+                        in_check = self._king_in_check_after_move(self.board, piece.color)
+                        self.board.unmake_move(move_info)
+                        if not in_check:
                             all_moves_illegal = False
                             break
                     if all_moves_illegal:
@@ -165,15 +182,14 @@ class Game:
         piece = self.board.get_piece(from_pos)
         if not piece or piece.color != self.turn or to_pos not in piece.legal_moves(self.board):
             return False
-        new_board = self.board.copy()
-        new_board.move_piece(from_pos, to_pos, promotion_piece)
-        if self._king_in_check_after_move(new_board, self.turn):
+        move_result = self.board.make_move(from_pos, to_pos, promotion_piece)
+        if self._king_in_check_after_move(self.board, self.turn):
+            self.board.unmake_move(move_result)
             return False
-        move_result = self.board.move_piece(from_pos, to_pos, promotion_piece)
-        special_move = "castling" if isinstance(piece, King) and abs(from_pos[1] - to_pos[1]) == 2 else "promotion" if move_result['promotion'] else "en_passant" if to_pos == self.board.en_passant_target else None
-        self.history.append((from_pos, to_pos, move_result['captured_piece'], special_move, promotion_piece))
+        special_move = "castling" if move_result['castling'] else "promotion" if move_result['promotion'] else "en_passant" if move_result['captured_pos'] != to_pos else None
+        self.history.append((from_pos, to_pos, move_result['captured_piece'], special_move, promotion_piece, move_result))
         self.switch_turn()
-        if self.ai_opponent and self.turn == self.ai_color:
+        if self.ai_opponent and self.ai_autoplay and self.turn == self.ai_color:
             self.make_ai_move()
         return True
 
@@ -0,0 +1,216 @@
+"""Root-split parallel search over a pool of worker processes.
+
+Each root move is searched in a worker process. Workers share the best
+root score found so far (alpha) through a multiprocessing.Value, so a
+move searched after a good one only has to prove it is no better, and
+one transposition table in shared memory, so a position searched under
+one root move is not searched again under another. They also add up
+their nodes in a shared counter, so a node budget covers all of them.
+"""
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from chess.engine import ChessAI, SearchAborted, Game
+from chess.transposition import SharedTranspositionTable
+
+# Settings copied from the parent ChessAI into every worker. The depth is not one of
+# them: it comes with each task, so changing it doesn't rebuild the pool.
+WORKER_SETTINGS = ('search_mode', 'eval_profile', 'quiescence_depth', 'aspiration_window',
+                   'use_null_move', 'null_move_reduction', 'use_late_move_reductions', 'lmr_history_threshold',
+                   'use_futility_pruning', 'futility_margins', 'use_razoring', 'razor_margins',
+                   'time_check_interval')
+
+# Transposition table counters each task reports back to the parent
+TABLE_COUNTERS = ('probes', 'hits', 'collisions', 'stores', 'overwrites')
+
+# Per-process state, set up once by _init_worker
+_worker_ai = None
+_worker_game = None
+_shared_alpha = None
+_shared_stop = None
+_shared_nodes = None
+
+
+def _init_worker(color, settings, shared_alpha, shared_stop, shared_nodes, table_name, table_size_mb):
+    global _worker_ai, _worker_game, _shared_alpha, _shared_stop, _shared_nodes
+    _worker_ai = ChessAI(color, tt_size_mb=0)
+    for name, value in settings.items():
+        setattr(_worker_ai, name, value)
+    _worker_ai.verbose = False
+    _worker_ai.transposition_table = SharedTranspositionTable.attach(table_name, table_size_mb)
+    _worker_ai.shared_stop = shared_stop
+    _worker_ai.shared_nodes = shared_nodes
+    _worker_game = Game(ai_opponent=False, ai_autoplay=False)
+    _shared_alpha = shared_alpha
+    _shared_stop = shared_stop
+    _shared_nodes = shared_nodes
+
+
+def _worker_imports_tkinter():
+    """Whether a worker process has tkinter loaded; a cheap first task for start-up checks."""
+    return 'tkinter' in sys.modules
+
+
+def _search_root_move(board, turn, move_count, move, depth, deadline, node_limit, generation):
+    """Search one root move in a worker.
+
+    Returns (move, score or None if stopped, whether the score is exact rather
+    than an upper bound, nodes, search stats, table counters).
+    """
+    # Tasks still queued when the search is stopped or out of time or nodes return straight away
+    if (_shared_stop.value or (deadline and time.time() >= deadline)
+            or (node_limit and _shared_nodes.value >= node_limit)):
+        return move, None, False, 0, {}, {}
+    ai = _worker_ai
+    game = _worker_game
+    game.board = board
+    game.turn = turn
+    game.move_count = move_count
+    ai.nodes_evaluated = 0
+    ai._reported_nodes = 0
+    ai._deadline = deadline
+    ai.shared_node_limit = node_limit
+    # The other workers' nodes only reach the shared count every time_check_interval
+    # nodes, so also cap this task at what was left of the budget when it started
+    ai._search_node_limit = node_limit - _shared_nodes.value if node_limit else None
+    ai.search_depth = depth
+    ai.killer_moves = [[None, None] for _ in range(depth + 1)]
+    ai.pv_table = {}
+    ai._reset_search_stats()
+    ai.transposition_table.generation = generation
+    ai.transposition_table.reset_stats()
+
+    # Only a score above the best root score so far matters
+    alpha = _shared_alpha.value
+    from_pos, to_pos, promotion = move
+    game.make_move(from_pos, to_pos, promotion)
+    try:
+        if ai.search_mode == 'pvs':
+            score = -ai._pvs(game, depth - 1, float('-inf'), -alpha, 0)
+        else:
+            score = ai._minimax(game, depth - 1, alpha, float('inf'), False, 0)
+    except SearchAborted:
+        score = None
+    ai._report_shared_nodes()
+    if score is None:
+        return move, None, False, ai.nodes_evaluated, ai.search_stats, _table_counts(ai)
+
+    # At or below alpha the search failed low, so the score is only an upper bound
+    exact = score > alpha
+    if exact:
+        with _shared_alpha.get_lock():
+            if score > _shared_alpha.value:
+                _shared_alpha.value = score
+    return move, score, exact, ai.nodes_evaluated, ai.search_stats, _table_counts(ai)
+
+
+def _table_counts(ai):
+    table = ai.transposition_table
+    return {name: getattr(table, name) for name in TABLE_COUNTERS}
+
+
+class RootSplitSearch:
+    """A process pool that searches the root moves of a ChessAI position in parallel."""
+    def __init__(self, ai, workers):
+        self.workers = workers
+        self.shared_alpha = multiprocessing.Value('d', float('-inf'))
+        self.shared_stop = multiprocessing.RawValue('b', 0)
+        self.shared_nodes = multiprocessing.Value('q', 0)
+        settings = {name: getattr(ai, name) for name in WORKER_SETTINGS}
+        self.settings_key = self.key_for(ai)
+        size_mb = ai.transposition_table.size_mb
+        self.transposition_table = SharedTranspositionTable(size_mb)
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                        initargs=(ai.color, settings, self.shared_alpha, self.shared_stop,
+                                                  self.shared_nodes, self.transposition_table.name, size_mb))
+
+    @staticmethod
+    def key_for(ai):
+        """Everything the workers were set up with; the pool is rebuilt when it changes."""
+        return (ai.color, ai.workers, ai.transposition_table.size_mb) + tuple(repr(getattr(ai, name)) for name in WORKER_SETTINGS)
+
+    def stop(self):
+        self.shared_stop.value = 1
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.transposition_table.close()
+
+    def search(self, ai, game, start_time):
+        """Iterative deepening where each iteration farms the root moves out to the pool."""
+        self.shared_stop.value = 0
+        self.shared_nodes.value = 0
+        ai.nodes_evaluated = 0
+        self.transposition_table.new_search()
+        legal_moves = ai._get_all_legal_moves(game, ai.color)
+        if not legal_moves:
+            return None
+        if len(legal_moves) == 1:
+            return legal_moves[0]
+        legal_moves = ai._sort_moves(game, legal_moves)
+        board = game.board.copy()
+        best_move = None
+
+        for current_depth in range(1, ai.search_depth + 1):
+            ai._log(f"Searching at depth {current_depth} on {self.workers} workers...")
+            adaptive_depth = ai._get_adaptive_depth(game, legal_moves, current_depth)
+            self.shared_alpha.value = float('-inf')
+            futures = [self.pool.submit(_search_root_move, board, game.turn, game.move_count, move,
+                                        adaptive_depth, ai._deadline, ai._search_node_limit,
+                                        self.transposition_table.generation)
+                       for move in legal_moves]
+
+            # Merge in move order so ties go to the move that was ordered first
+            results = []
+            completed = True
+            for future in futures:
+                while True:
+                    try:
+                        move, score, exact, nodes, stats, table_counts = future.result(timeout=0.05)
+                        break
+                    except FutureTimeoutError:
+                        # Pass a stop from the GUI/UCI thread on to the workers
+                        if ai.stop_event.is_set():
+                            self.stop()
+                ai.nodes_evaluated += nodes
+                for name, count in stats.items():
+                    ai.search_stats[name] += count
+                # The parent's own table isn't probed in a parallel search, so it
+                # carries the workers' counts for stats() and the search summary
+                for name, count in table_counts.items():
+                    setattr(ai.transposition_table, name, getattr(ai.transposition_table, name) + count)
+                if score is None:
+                    # The iteration can't complete; let the other workers give up too
+                    completed = False
+                    self.stop()
+                else:
+                    results.append((score, exact, move))
+
+            current_best_score, current_best_move, current_best_exact = float('-inf'), None, False
+            for score, exact, move in results:
+                # A fail-low score can equal the best one without being reached; prefer the move that reached it
+                if score > current_best_score or (score == current_best_score and exact and not current_best_exact):
+                    current_best_score, current_best_move, current_best_exact = score, move, exact
+            if not completed:
+                if best_move is None:
+                    best_move = current_best_move or legal_moves[0]
+                ai._log(f"Search stopped during depth {current_depth}")
+                break
+
+            best_move = current_best_move
+            ai.previous_eval = current_best_score
+            ai._log(f"Depth {current_depth}: Best move {best_move}, Score: {current_best_score}")
+            ai._report_progress(current_depth, best_move, current_best_score, start_time, completed=True)
+
+            # Search the best move first next time, then the others by this iteration's scores
+            scores = {move: score for score, exact, move in results}
+            legal_moves.sort(key=lambda move: scores.get(move, float('-inf')), reverse=True)
+
+            if ai._out_of_time(start_time) or abs(current_best_score) > 90000:
+                break
+            if ai._search_node_limit and ai.nodes_evaluated >= ai._search_node_limit:
+                break
+
+        ai._print_search_stats(start_time)
+        return best_move
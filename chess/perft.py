@@ -0,0 +1,110 @@
+"""Perft: count the leaf nodes of the legal move tree to check and time move generation.
+
+Run with: python -m chess.perft [depth] [--position NAME] [--divide]
+"""
+import argparse
+import time
+from chess.board import Board
+
+# Standard perft positions with their known node counts for depth 1, 2, 3, ...
+PERFT_POSITIONS = {
+    'start': ('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+              [20, 400, 8902, 197281, 4865609]),
+    'kiwipete': ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                 [48, 2039, 97862, 4085603]),
+    'endgame': ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+                [14, 191, 2812, 43238, 674624]),
+    'promotions': ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+                   [6, 264, 9467, 422333]),
+    'talkchess': ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+                  [44, 1486, 62379, 2103487]),
+    'middlegame': ('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+                   [46, 2079, 89890, 3894594]),
+}
+
+
+def perft(board, depth):
+    """Number of leaf nodes `depth` plies below the position on `board`."""
+    color = board.side_to_move
+    moves = board.generate_legal_moves(color)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for from_pos, to_pos, promotion in moves:
+        move_info = board.make_move(from_pos, to_pos, promotion)
+        nodes += perft(board, depth - 1)
+        board.unmake_move(move_info)
+    return nodes
+
+
+def divide(board, depth):
+    """Perft split by root move, as {move: nodes}, for tracking down a wrong count."""
+    counts = {}
+    for move in board.generate_legal_moves(board.side_to_move):
+        move_info = board.make_move(*move)
+        counts[move] = perft(board, depth - 1)
+        board.unmake_move(move_info)
+    return counts
+
+
+def move_to_uci(move):
+    """(from_pos, to_pos, promotion) as a long algebraic string such as e2e4 or a7a8q."""
+    from_pos, to_pos, promotion = move
+    text = ''.join(chr(ord('a') + pos[1]) + str(8 - pos[0]) for pos in (from_pos, to_pos))
+    return text + promotion.lower() if promotion else text
+
+
+def run_perft_suite(max_depth=3, positions=None):
+    """Run perft on the reference positions up to max_depth and check every count.
+
+    Prints nodes, time and nodes per second per position and depth, and
+    returns True if every count matched. Asking for a depth a position has
+    no reference count for is an error, so a run never passes unchecked.
+    """
+    positions = positions or list(PERFT_POSITIONS)
+    for name in positions:
+        known_depth = len(PERFT_POSITIONS[name][1])
+        if max_depth > known_depth:
+            raise ValueError(f"No reference count for '{name}' past depth {known_depth}")
+    all_passed = True
+    total_nodes = 0
+    total_seconds = 0.0
+    print(f"{'position':<12}{'depth':>6}{'nodes':>10}{'expected':>10}{'seconds':>9}{'nps':>9}")
+    for name in positions:
+        fen, expected_counts = PERFT_POSITIONS[name]
+        board = Board.from_fen(fen)
+        for depth, expected in enumerate(expected_counts[:max_depth], 1):
+            start = time.time()
+            nodes = perft(board, depth)
+            seconds = time.time() - start
+            total_nodes += nodes
+            total_seconds += seconds
+            status = '' if nodes == expected else '  FAIL'
+            all_passed = all_passed and nodes == expected
+            print(f"{name:<12}{depth:>6}{nodes:>10}{expected:>10}{seconds:>9.2f}"
+                  f"{nodes / max(seconds, 1e-9):>9.0f}{status}")
+    print(f"{'total':<12}{'':>6}{total_nodes:>10}{'':>10}{total_seconds:>9.2f}"
+          f"{total_nodes / max(total_seconds, 1e-9):>9.0f}")
+    return all_passed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Move generator perft")
+    parser.add_argument('depth', nargs='?', type=int, default=3)
+    parser.add_argument('--position', choices=sorted(PERFT_POSITIONS),
+                        help="only run this reference position")
+    parser.add_argument('--divide', action='store_true',
+                        help="print the node count under every root move of --position")
+    args = parser.parse_args()
+    if args.divide:
+        board = Board.from_fen(PERFT_POSITIONS[args.position or 'start'][0])
+        counts = divide(board, args.depth)
+        for move, nodes in sorted(counts.items(), key=lambda item: move_to_uci(item[0])):
+            print(f"{move_to_uci(move)}: {nodes}")
+        print(f"\nMoves: {len(counts)}\nNodes: {sum(counts.values())}")
+    else:
+        try:
+            passed = run_perft_suite(args.depth, [args.position] if args.position else None)
+        except ValueError as error:
+            parser.error(str(error))
+        raise SystemExit(0 if passed else 1)
@@ -148,18 +148,7 @@ class King(Piece):
     def _adjacent_to_enemy_king(self, board, pos):
         """Check if the given position is adjacent to the opponent's king"""
         opponent_color = 'white' if self.color == 'black' else 'black'
-        
-        # Find opponent's king
-        opponent_king_pos = None
-        for r in range(8):
-            for c in range(8):
-                piece = board.grid[r][c]
-                if piece and isinstance(piece, King) and piece.color == opponent_color:
-                    opponent_king_pos = (r, c)
-                    break
-            if opponent_king_pos:
-                break
-                
+        opponent_king_pos = board.king_positions[opponent_color]
         if not opponent_king_pos:
             return False
             
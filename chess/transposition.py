@@ -0,0 +1,329 @@
+from array import array
+
+EXACT = 0
+UPPER_BOUND = 1
+LOWER_BOUND = -1
+
+
+class TranspositionTable:
+    """Fixed-size transposition table indexed by the low bits of the Zobrist key.
+
+    Each slot holds one (key, depth, score, flag, best_move, generation) tuple.
+    A new entry replaces the old one if it is for the same position, if the old
+    one was stored during an earlier search (an older generation), or if it was
+    searched at least as deep. The table is meant to live for a whole game:
+    call new_search() before each move instead of clearing it.
+    """
+    # Rough size of one stored entry in CPython (tuple, key, score and move)
+    ENTRY_BYTES = 200
+
+    def __init__(self, size_mb=16):
+        self.size_mb = size_mb
+        slots = max(1, int(size_mb * 1024 * 1024) // self.ENTRY_BYTES)
+        # Round down to a power of two so the index is a mask of the key
+        self.size = 1 << (slots.bit_length() - 1)
+        self.mask = self.size - 1
+        self.clear()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.collisions = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self):
+        """Age existing entries so they become the first to be replaced."""
+        self.generation = (self.generation + 1) & 0xFF
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.generation = 0
+
+    def probe(self, key):
+        """Return (depth, score, flag, best_move) stored for key, or None."""
+        self.probes += 1
+        entry = self.slots[key & self.mask]
+        if entry is None:
+            return None
+        if entry[0] != key:
+            self.collisions += 1
+            return None
+        self.hits += 1
+        return entry[1:5]
+
+    def store(self, key, depth, score, flag, best_move=None):
+        index = key & self.mask
+        entry = self.slots[index]
+        if entry is not None:
+            if entry[0] == key:
+                # Keep the move we already know if this search didn't produce one
+                if best_move is None:
+                    best_move = entry[4]
+                if depth < entry[1] and entry[5] == self.generation and flag != EXACT:
+                    return
+            elif entry[5] == self.generation and depth < entry[1]:
+                return
+            else:
+                self.overwrites += 1
+        self.stores += 1
+        self.slots[index] = (key, depth, score, flag, best_move, self.generation)
+
+    def best_move(self, key):
+        entry = self.slots[key & self.mask]
+        return entry[4] if entry is not None and entry[0] == key else None
+
+    def used(self):
+        """Fraction of slots holding an entry."""
+        return sum(1 for entry in self.slots if entry is not None) / self.size
+
+    def stats(self):
+        return {
+            'size_mb': self.size_mb,
+            'slots': self.size,
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+        }
+
+
+# Packed entry layout, low bits first:
+#   score * 100 + 2**31    32 bits
+#   depth                   6 bits
+#   flag + 1                2 bits
+#   generation              8 bits
+#   move                   16 bits
+SCORE_SCALE = 100
+SCORE_OFFSET = 1 << 31
+MAX_PACKED_SCORE = (SCORE_OFFSET - 1) / SCORE_SCALE
+MAX_PACKED_DEPTH = 63
+DEPTH_SHIFT = 32
+FLAG_SHIFT = 38
+GENERATION_SHIFT = 40
+MOVE_SHIFT = 48
+
+# Move layout: from square (6 bits), to square (6 bits), promotion (3 bits) and a
+# flag for moves given as 0-63 square numbers rather than (row, col) tuples
+PROMOTION_CODES = {None: 0, 'Q': 1, 'R': 2, 'B': 3, 'N': 4}
+PROMOTION_LETTERS = {code: letter for letter, code in PROMOTION_CODES.items()}
+SQUARE_MOVE_FLAG = 1 << 15
+NO_MOVE = 0xFFFF
+
+
+def pack_move(move):
+    if move is None:
+        return NO_MOVE
+    from_pos, to_pos, promotion = move
+    if isinstance(from_pos, int):
+        code = SQUARE_MOVE_FLAG | from_pos | (to_pos << 6)
+    else:
+        code = (from_pos[0] * 8 + from_pos[1]) | ((to_pos[0] * 8 + to_pos[1]) << 6)
+    return code | (PROMOTION_CODES[promotion] << 12)
+
+
+def unpack_move(code):
+    if code == NO_MOVE:
+        return None
+    from_sq = code & 63
+    to_sq = (code >> 6) & 63
+    promotion = PROMOTION_LETTERS[(code >> 12) & 7]
+    if code & SQUARE_MOVE_FLAG:
+        return (from_sq, to_sq, promotion)
+    return ((from_sq >> 3, from_sq & 7), (to_sq >> 3, to_sq & 7), promotion)
+
+
+class PackedTranspositionTable(TranspositionTable):
+    """TranspositionTable that stores each entry in two 64-bit array slots.
+
+    One array holds the packed entry, the other holds key ^ entry, so a probe
+    can check that both halves belong together: a torn or foreign slot simply
+    fails to match. That costs 16 bytes a position instead of the ~200 a tuple
+    needs. Scores are kept to two decimal places.
+    """
+    ENTRY_BYTES = 16
+
+    def clear(self):
+        self.keys = array('Q', [0]) * self.size
+        self.data = array('Q', [0]) * self.size
+        self.generation = 0
+
+    def _read(self, key):
+        index = key & self.mask
+        data = self.data[index]
+        if data == 0:
+            return None, index
+        if self.keys[index] ^ data != key:
+            return False, index
+        return data, index
+
+    def probe(self, key):
+        """Return (depth, score, flag, best_move) stored for key, or None."""
+        self.probes += 1
+        data, _ = self._read(key)
+        if data is None:
+            return None
+        if data is False:
+            self.collisions += 1
+            return None
+        self.hits += 1
+        return ((data >> DEPTH_SHIFT) & 63,
+                ((data & 0xFFFFFFFF) - SCORE_OFFSET) / SCORE_SCALE,
+                ((data >> FLAG_SHIFT) & 3) - 1,
+                unpack_move(data >> MOVE_SHIFT))
+
+    def store(self, key, depth, score, flag, best_move=None):
+        data, index = self._read(key)
+        move_code = pack_move(best_move)
+        if data:
+            old_depth = (data >> DEPTH_SHIFT) & 63
+            same_generation = (data >> GENERATION_SHIFT) & 0xFF == self.generation
+            if move_code == NO_MOVE:
+                move_code = data >> MOVE_SHIFT
+            if depth < old_depth and same_generation and flag != EXACT:
+                return
+        elif data is False:
+            old = self.data[index]
+            if (old >> GENERATION_SHIFT) & 0xFF == self.generation and depth < (old >> DEPTH_SHIFT) & 63:
+                return
+            self.overwrites += 1
+        score = max(-MAX_PACKED_SCORE, min(MAX_PACKED_SCORE, score))
+        entry = (int(round(score * SCORE_SCALE)) + SCORE_OFFSET
+                 | min(max(depth, 0), MAX_PACKED_DEPTH) << DEPTH_SHIFT
+                 | (flag + 1) << FLAG_SHIFT
+                 | self.generation << GENERATION_SHIFT
+                 | move_code << MOVE_SHIFT)
+        self.stores += 1
+        self.data[index] = entry
+        self.keys[index] = key ^ entry
+
+    def best_move(self, key):
+        data, _ = self._read(key)
+        return unpack_move(data >> MOVE_SHIFT) if data else None
+
+    def used(self):
+        """Fraction of slots holding an entry."""
+        return (self.size - self.data.count(0)) / self.size
+
+
+class SharedTranspositionTable(PackedTranspositionTable):
+    """PackedTranspositionTable whose slots live in a multiprocessing.shared_memory block.
+
+    One process creates the table and the others attach to it by name, so
+    parallel search workers see each other's entries. There is no lock:
+    each entry is written as two 64-bit words (entry and key ^ entry), and
+    a reader that catches a slot half-written by another process just
+    sees a key mismatch, i.e. a miss.
+    """
+    def __init__(self, size_mb=16, name=None):
+        self._attach_name = name
+        super().__init__(size_mb)
+
+    @classmethod
+    def attach(cls, name, size_mb):
+        return cls(size_mb, name)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def clear(self):
+        if getattr(self, 'shm', None) is None:
+            self._open()
+        else:
+            self.shm.buf[:] = bytes(len(self.shm.buf))
+        self.generation = 0
+
+    def _open(self):
+        # Imported here: it pulls in most of multiprocessing, which plain searches never need
+        from multiprocessing import shared_memory
+        nbytes = self.size * 16
+        if self._attach_name is None:
+            self.owner = True
+            # A new block is already zero-filled, i.e. every slot empty
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.owner = False
+            try:
+                self.shm = shared_memory.SharedMemory(name=self._attach_name, track=False)
+            except TypeError:
+                # Before Python 3.13 attaching always registers the block, but worker
+                # processes share the creator's resource tracker, which keeps one
+                # entry per name, so the creator's unlink still clears it
+                self.shm = shared_memory.SharedMemory(name=self._attach_name)
+        words = self.shm.buf[:nbytes].cast('Q')
+        self._words = words
+        self.data = words[:self.size]
+        self.keys = words[self.size:]
+
+    def close(self):
+        """Detach from the block; the creating process also frees it."""
+        for view in (self.data, self.keys, self._words):
+            view.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def used(self):
+        return (self.size - self.data.tolist().count(0)) / self.size
+
+
+class EvaluationCache:
+    """Fixed-size, always-replace cache of scores keyed by a 64-bit position key.
+
+    Used for static evaluations (keyed by the Zobrist key) and pawn-structure
+    scores (keyed by the pawn-only key).
+    """
+    ENTRY_BYTES = 16
+
+    def __init__(self, size_mb=4):
+        self.size_mb = size_mb
+        slots = max(1, int(size_mb * 1024 * 1024) // self.ENTRY_BYTES)
+        self.size = 1 << (slots.bit_length() - 1)
+        self.mask = self.size - 1
+        self.clear()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self):
+        self.keys = array('Q', [0]) * self.size
+        self.values = array('d', [0.0]) * self.size
+
+    def probe(self, key):
+        """Return the score stored for key, or None."""
+        self.probes += 1
+        index = key & self.mask
+        if self.keys[index] == key:
+            self.hits += 1
+            return self.values[index]
+        return None
+
+    def store(self, key, value):
+        index = key & self.mask
+        self.keys[index] = key
+        self.values[index] = value
+
+    def stats(self):
+        return {
+            'size_mb': self.size_mb,
+            'slots': self.size,
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+        }
+
+
+def create_transposition_table(size_mb=16, layout='packed'):
+    """Build a table with the 'packed' (array) or 'tuple' (list of tuples) layout."""
+    if layout == 'packed':
+        return PackedTranspositionTable(size_mb)
+    if layout == 'tuple':
+        return TranspositionTable(size_mb)
+    raise ValueError(f"Unknown transposition table layout: {layout}")
+
@@ -0,0 +1,211 @@
+"""Headless UCI front end for ChessAI over stdin/stdout.
+
+Run with: python -m chess.uci
+
+Supports uci, isready, ucinewgame, setoption (Hash, Threads, SearchMode),
+position startpos|fen ... [moves ...], go depth/movetime/wtime/btime/
+winc/binc/nodes/infinite, stop and quit. While a search runs it sends an
+info line with depth, score, nodes, nps, time and pv whenever the best
+move changes.
+"""
+import sys
+import threading
+import time
+from chess.engine import STARTING_FEN, Game, ChessAI
+from chess.perft import move_to_uci
+
+ENGINE_NAME = 'AI-Chess'
+ENGINE_AUTHOR = 'AI-Chess contributors'
+
+# Iterative deepening ceiling when go gives no depth; time, nodes or stop end the search first
+UCI_MAX_DEPTH = 30
+
+FILES = 'abcdefgh'
+RANKS = '12345678'
+
+
+def uci_to_move(text):
+    """Long algebraic notation such as e2e4 or a7a8q as (from_pos, to_pos, promotion)."""
+    if (len(text) not in (4, 5) or text[0] not in FILES or text[2] not in FILES
+            or text[1] not in RANKS or text[3] not in RANKS or text[4:] not in ('', 'q', 'r', 'b', 'n')):
+        raise ValueError(f"Invalid move '{text}'")
+    from_pos = (8 - int(text[1]), ord(text[0]) - ord('a'))
+    to_pos = (8 - int(text[3]), ord(text[2]) - ord('a'))
+    promotion = text[4].upper() if len(text) == 5 else None
+    return from_pos, to_pos, promotion
+
+
+class UCIEngine:
+    """Reads UCI commands, keeps the game position and runs searches on a worker thread."""
+    def __init__(self, input_stream=None, output_stream=None):
+        self.input = input_stream or sys.stdin
+        self.output = output_stream or sys.stdout
+        self.output_lock = threading.Lock()
+        self.game = Game(ai_opponent=False, ai_autoplay=False)
+        self.ai = self._new_ai(tt_size_mb=16)
+        self.search_thread = None
+
+    def _new_ai(self, tt_size_mb, search_mode='pvs'):
+        ai = ChessAI(self.game.turn, UCI_MAX_DEPTH, tt_size_mb=tt_size_mb, search_mode=search_mode)
+        ai.verbose = False
+        # Iterative deepening starts from depth 1 so any time limit still gets a move
+        ai.min_depth = 1
+        return ai
+
+    def send(self, line):
+        with self.output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def run(self):
+        """Handle commands until quit or end of input."""
+        for line in self.input:
+            if not self.handle(line.strip()):
+                break
+        self.stop_search()
+        self.ai.close()
+
+    def handle(self, line):
+        """Handle one command line; returns False for quit."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == 'quit':
+            return False
+        if command == 'uci':
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send("option name Hash type spin default 16 min 1 max 1024")
+            self.send("option name Threads type spin default 1 min 1 max 64")
+            self.send("option name SearchMode type combo default pvs var pvs var minimax")
+            self.send("uciok")
+        elif command == 'isready':
+            self.send("readyok")
+        elif command == 'ucinewgame':
+            self.stop_search()
+            self.game.load_fen(STARTING_FEN)
+            self.ai.set_color(self.game.turn)
+        elif command == 'setoption':
+            self.stop_search()
+            self.set_option(args)
+        elif command == 'position':
+            self.stop_search()
+            self.set_position(args)
+        elif command == 'go':
+            self.stop_search()
+            self.start_search(args)
+        elif command == 'stop':
+            self.stop_search()
+        else:
+            self.send(f"info string unknown command {command}")
+        return True
+
+    def set_option(self, args):
+        if 'name' not in args or 'value' not in args:
+            return
+        name = ' '.join(args[args.index('name') + 1:args.index('value')]).lower()
+        value = ' '.join(args[args.index('value') + 1:])
+        try:
+            if name in ('hash', 'threads'):
+                value = int(value)
+        except ValueError:
+            self.send(f"info string invalid value {value} for {name}")
+            return
+        if name == 'hash':
+            workers = self.ai.workers
+            self.ai.close()
+            self.ai = self._new_ai(value, self.ai.search_mode)
+            self.ai.workers = workers
+        elif name == 'threads':
+            self.ai.workers = max(1, value)
+        elif name == 'searchmode' and value in ('pvs', 'minimax'):
+            self.ai.search_mode = value
+
+    def set_position(self, args):
+        """position startpos|fen <fen> [moves <move> ...]"""
+        moves = []
+        if 'moves' in args:
+            moves = args[args.index('moves') + 1:]
+            args = args[:args.index('moves')]
+        fen = ' '.join(args[1:]) if args and args[0] == 'fen' else STARTING_FEN
+        try:
+            self.game.load_fen(fen)
+        except (ValueError, IndexError):
+            self.send(f"info string invalid fen {fen}")
+            return
+        # A bad move leaves the position at the last good one instead of ending the loop
+        for text in moves:
+            try:
+                move = uci_to_move(text)
+            except ValueError:
+                self.send(f"info string invalid move {text}")
+                break
+            if move not in self.game.board.generate_legal_moves(self.game.turn):
+                self.send(f"info string illegal move {text}")
+                break
+            self.game.play_move(*move)
+
+    def start_search(self, args):
+        """go [depth N] [movetime MS] [wtime MS] [btime MS] [winc MS] [binc MS] [nodes N] [infinite]"""
+        params = {}
+        for i, token in enumerate(args):
+            if token in ('depth', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'nodes', 'movestogo') and i + 1 < len(args):
+                try:
+                    params[token] = int(args[i + 1])
+                except ValueError:
+                    # No search is started, so no bestmove follows
+                    self.send(f"info string invalid {token} {args[i + 1]}")
+                    return
+
+        turn = self.game.turn
+        options = {'depth': params.get('depth'), 'node_limit': params.get('nodes')}
+        if 'movetime' in params:
+            options['move_time'] = params['movetime'] / 1000.0
+        elif ('wtime' if turn == 'white' else 'btime') in params:
+            options['time_left'] = params['wtime' if turn == 'white' else 'btime'] / 1000.0
+            options['increment'] = params.get('winc' if turn == 'white' else 'binc', 0) / 1000.0
+        else:
+            # depth, nodes, infinite or a bare go: no clock, only stop ends it
+            options['move_time'] = 0
+
+        if self.ai.color != turn:
+            self.ai.set_color(turn)
+        # Searches never touch this game, so it is safe to read while one runs
+        game = self.game
+        start_time = time.time()
+        self.ai.progress_callback = lambda info: self.send_info(game, info, start_time)
+        # Made here, not in the thread, so a stop that arrives before the search starts still counts
+        options['stop_event'] = self.ai.new_stop_event()
+        self.search_thread = threading.Thread(target=self._search, args=(game, options), daemon=True)
+        self.search_thread.start()
+
+    def _search(self, game, options):
+        move = self.ai.choose_move(game, **options)
+        self.send(f"bestmove {move_to_uci(move) if move else '0000'}")
+
+    def stop_search(self):
+        """Interrupt a running search; it still sends its bestmove."""
+        if self.search_thread is not None:
+            self.ai.stop()
+            self.search_thread.join()
+            self.search_thread = None
+
+    def send_info(self, game, info, start_time):
+        elapsed = max(time.time() - start_time, 1e-3)
+        move = info['best_move']
+        pv = self.ai.principal_variation(game.board, move, info['depth']) if move else []
+        score = info['score']
+        if abs(score) >= 90000:
+            # Mate scores don't carry the distance, so the PV length stands in for it
+            moves_to_mate = (len(pv) + 1) // 2
+            score_text = f"mate {moves_to_mate if score > 0 else -moves_to_mate}"
+        else:
+            score_text = f"cp {round(score)}"
+        self.send(f"info depth {info['depth']} score {score_text} nodes {info['nodes']} "
+                  f"nps {round(info['nodes'] / elapsed)} time {round(elapsed * 1000)} "
+                  f"pv {' '.join(move_to_uci(pv_move) for pv_move in pv)}")
+
+
+if __name__ == '__main__':
+    UCIEngine().run()
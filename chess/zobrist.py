@@ -0,0 +1,31 @@
+import random
+
+# Fixed seed so keys (and anything stored under them) are identical across processes
+_rng = random.Random(0x9E3779B97F4A7C15)
+
+PIECE_TYPES = ['Pawn', 'Knight', 'Bishop', 'Rook', 'Queen', 'King']
+
+# PIECE_KEYS[color][piece type][row * 8 + col]
+PIECE_KEYS = {
+    color: {name: [_rng.getrandbits(64) for _ in range(64)] for name in PIECE_TYPES}
+    for color in ('white', 'black')
+}
+
+# XORed in when black is to move
+SIDE_KEY = _rng.getrandbits(64)
+
+# Indexed by the castling rights bitmask (see Board.castling_rights)
+CASTLING_KEYS = [_rng.getrandbits(64) for _ in range(16)]
+
+# Indexed by the file of the en passant target square
+EN_PASSANT_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+
+
+def piece_key(piece, pos):
+    """Key contribution of `piece` standing on `pos`."""
+    return PIECE_KEYS[piece.color][piece.__class__.__name__][pos[0] * 8 + pos[1]]
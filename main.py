@@ -1,7 +1,18 @@
-import tkinter as tk
-from chess.chess_gui import ChessGUI
+import sys
 
-if __name__ == '__main__':
+
+def main():
+    if '--uci' in sys.argv[1:]:
+        # Headless: the UCI engine never imports tkinter
+        from chess.uci import UCIEngine
+        UCIEngine().run()
+        return
+    import tkinter as tk
+    from chess.chess_gui import ChessGUI
     root = tk.Tk()
     app = ChessGUI(root)
-    root.mainloop() 
\ No newline at end of file
+    root.mainloop()
+
+
+if __name__ == '__main__':
+    main()
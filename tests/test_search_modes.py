@@ -0,0 +1,29 @@
+"""PVS and minimax agree on the benchmark positions."""
+import pytest
+from chess.benchmark import BENCHMARK_POSITIONS, benchmark_position
+from chess.engine import ChessAI
+
+SEARCH_DEPTH = 2
+
+
+def _search(name, search_mode):
+    game = benchmark_position(name)
+    ai = ChessAI(game.turn, SEARCH_DEPTH, search_mode=search_mode)
+    ai.verbose = False
+    # Only the selective pruning differs on purpose between the two searches
+    ai.use_null_move = False
+    ai.use_late_move_reductions = False
+    ai.use_futility_pruning = False
+    ai.use_razoring = False
+    move = ai.choose_move(game, depth=SEARCH_DEPTH)
+    ai.close()
+    return move, ai.previous_eval
+
+
+@pytest.mark.parametrize('name', list(BENCHMARK_POSITIONS))
+def test_pvs_and_minimax_choose_the_same_move(name):
+    pvs_move, pvs_score = _search(name, 'pvs')
+    minimax_move, minimax_score = _search(name, 'minimax')
+    assert pvs_move == minimax_move
+    # The transposition table keeps scores to two decimal places
+    assert pvs_score == pytest.approx(minimax_score, abs=0.01)
@@ -0,0 +1,66 @@
+"""SharedTranspositionTable under concurrent writes from several processes."""
+import multiprocessing
+import random
+from chess.transposition import SharedTranspositionTable
+
+# A small table, so the writers keep landing on each other's slots
+TABLE_SIZE_MB = 0.01
+
+
+def _key(n):
+    return random.Random(n).getrandbits(64) | 1
+
+
+def _entry(key):
+    """The (depth, score, flag, best_move) every writer stores for key."""
+    from_sq = key % 64
+    to_sq = (key >> 6) % 64
+    return ((key >> 12) % 60 + 1, ((key >> 20) % 200001 - 100000) / 10, (key >> 40) % 3 - 1,
+            ((from_sq >> 3, from_sq & 7), (to_sq >> 3, to_sq & 7), None))
+
+
+def _writer(name, seed, writes, results):
+    table = SharedTranspositionTable.attach(name, TABLE_SIZE_MB)
+    rng = random.Random(seed)
+    corrupted = 0
+    for _ in range(writes):
+        key = _key(rng.randrange(4096))
+        table.store(key, *_entry(key))
+        probe_key = _key(rng.randrange(4096))
+        entry = table.probe(probe_key)
+        if entry is not None and entry != _entry(probe_key):
+            corrupted += 1
+    results.put((table.probes, table.hits, corrupted))
+    table.close()
+
+
+def test_concurrent_writers_never_read_a_corrupted_entry():
+    table = SharedTranspositionTable(TABLE_SIZE_MB)
+    try:
+        results = multiprocessing.Queue()
+        writers = [multiprocessing.Process(target=_writer, args=(table.name, seed, 20000, results))
+                   for seed in range(4)]
+        for writer in writers:
+            writer.start()
+        totals = [results.get(timeout=120) for _ in writers]
+        for writer in writers:
+            writer.join()
+    finally:
+        table.close()
+
+    hits = sum(result[1] for result in totals)
+    corrupted = sum(result[2] for result in totals)
+    assert hits > 0
+    assert corrupted == 0
+
+
+def test_attached_table_sees_entries_stored_by_the_creator():
+    table = SharedTranspositionTable(TABLE_SIZE_MB)
+    attached = SharedTranspositionTable.attach(table.name, TABLE_SIZE_MB)
+    try:
+        key = _key(1)
+        table.store(key, *_entry(key))
+        assert attached.probe(key) == _entry(key)
+    finally:
+        attached.close()
+        table.close()
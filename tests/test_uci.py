@@ -0,0 +1,47 @@
+"""The UCI front end, driven one command at a time."""
+import io
+from chess.uci import UCIEngine
+
+
+def _engine():
+    return UCIEngine(io.StringIO(''), io.StringIO())
+
+
+def _lines(engine):
+    return engine.output.getvalue().splitlines()
+
+
+def test_go_nodes_stops_a_parallel_search():
+    engine = _engine()
+    try:
+        for command in ('setoption name Threads value 2', 'position startpos', 'go nodes 300'):
+            engine.handle(command)
+        engine.search_thread.join(30)
+        assert not engine.search_thread.is_alive()
+        assert _lines(engine)[-1].startswith('bestmove ')
+        # Workers only publish their counts every time_check_interval nodes
+        assert engine.ai.nodes_evaluated <= 300 + 2 * engine.ai.time_check_interval
+    finally:
+        engine.stop_search()
+        engine.ai.close()
+
+
+def test_malformed_input_is_reported_and_the_loop_keeps_running():
+    engine = _engine()
+    commands = ('go depth x', 'setoption name Hash value big', 'setoption name Threads value y',
+                'position fen rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e 0 1',
+                'position startpos moves e2e4 zz99', 'position startpos moves e2e4 e1e3', 'isready')
+    for command in commands:
+        assert engine.handle(command)
+    assert _lines(engine) == [
+        'info string invalid depth x',
+        'info string invalid value big for hash',
+        'info string invalid value y for threads',
+        'info string invalid fen rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e 0 1',
+        'info string invalid move zz99',
+        'info string illegal move e1e3',
+        'readyok',
+    ]
+    # The position stops at the last good move
+    assert engine.game.turn == 'black'
+    engine.ai.close()